@@ -0,0 +1,103 @@
+'''
+Пропускная способность при множестве одновременных соединений:
+синхронные вьюсеты против async-представлений под ASGI.
+
+Сервер запускается отдельно, например:
+
+    SERVER_MODE=asgi WEB_CONCURRENCY=1 ./entrypoint.sh
+    python -m benchmarks.async_load --url http://127.0.0.1:8000 \
+        --concurrency 10 100 --requests 2000
+
+Клиент на asyncio из стандартной библиотеки: каждый запрос открывает
+своё соединение с Connection: close. Анонимные списки кешируются
+(CachedListMixin), поэтому у каждого запроса свой параметр nocache:
+сравниваются чтение из БД и сериализация, а не попадания в кеш.
+'''
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+PATHS = {
+    'sync': '/posts/posts/',
+    'async': '/posts/async/posts/',
+}
+
+
+async def fetch(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f'GET {path} HTTP/1.1\r\nHost: {host}\r\n'
+        f'Accept: application/json\r\nConnection: close\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(response.split(b' ', 2)[1])
+
+
+async def run(host, port, path, concurrency, total):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+    # Уникален и между прогонами: ключ кеша — полный URI
+    prefix = time.monotonic_ns()
+
+    async def worker():
+        nonlocal errors
+        for number in remaining:
+            started = time.perf_counter()
+            try:
+                code = await fetch(
+                    host, port, f'{path}?nocache={prefix}-{number}'
+                )
+            except OSError:
+                code = None
+            latencies.append((time.perf_counter() - started) * 1000)
+            if code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'rps': total / elapsed,
+        'p50': statistics.median(latencies),
+        'p99': latencies[int(len(latencies) * 0.99) - 1],
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument(
+        '--concurrency', type=int, nargs='+', default=[1, 10, 50, 100]
+    )
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    print(
+        f'{"view":>6}{"conns":>7}{"req/s":>10}'
+        f'{"p50, ms":>10}{"p99, ms":>10}{"errors":>8}'
+    )
+    for concurrency in args.concurrency:
+        for name, path in PATHS.items():
+            result = asyncio.run(run(
+                url.hostname, url.port or 80, path,
+                concurrency, args.requests
+            ))
+            print(
+                f'{name:>6}{concurrency:>7}{result["rps"]:>10.0f}'
+                f'{result["p50"]:>10.1f}{result["p99"]:>10.1f}'
+                f'{result["errors"]:>8}'
+            )
+
+
+if __name__ == '__main__':
+    main()
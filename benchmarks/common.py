@@ -0,0 +1,32 @@
+'''Общие помощники для бенчмарков: настройка Django и замер времени'''
+import os
+import statistics
+import time
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+def server_name():
+    '''
+    Хост из ALLOWED_HOSTS для тестового клиента и фабрики запросов: их
+    testserver по умолчанию в боевых настройках не разрешён
+    '''
+    from django.conf import settings
+    for host in settings.ALLOWED_HOSTS:
+        if host and host != '*' and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def measure(func, repeat):
+    '''Медиана и минимум времени выполнения func в миллисекундах'''
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), min(timings)
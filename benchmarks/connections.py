@@ -0,0 +1,61 @@
+'''
+Накладные расходы на соединение с PostgreSQL в каждом запросе.
+
+Цикл запроса воспроизводится сигналами request_started/request_finished,
+как их отправляет обработчик Django, с одним SELECT 1 внутри:
+
+- CONN_MAX_AGE=0 — новое соединение на каждый запрос (прежнее поведение);
+- CONN_MAX_AGE=60 — соединение переиспользуется;
+- CONN_MAX_AGE=60 и CONN_HEALTH_CHECKS — плюс проверка при первом
+  обращении к БД в запросе.
+
+Через pgbouncer замер показывает стоимость подключения к пулу:
+
+    python -m benchmarks.connections --requests 500
+'''
+import argparse
+
+from benchmarks.common import measure, setup_django
+
+
+SCENARIOS = (
+    ('new connection', 0, False),
+    ('persistent', 60, False),
+    ('persistent + check', 60, True),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.signals import request_finished, request_started
+    from django.db import connection
+
+    def request():
+        request_started.send(sender=None)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        request_finished.send(sender=None)
+
+    print(
+        f'{"scenario":<22}{"median, ms":>12}{"min, ms":>10}{"saved, ms":>12}'
+    )
+    baseline = None
+    for name, max_age, health_checks in SCENARIOS:
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+        median, minimum = measure(request, args.requests)
+        baseline = baseline or median
+        print(
+            f'{name:<22}{median:>12.3f}{minimum:>10.3f}'
+            f'{baseline - median:>12.3f}'
+        )
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+'''
+JSON на страницах из 1000 постов: JSONRenderer/JSONParser DRF против
+FastJSONRenderer/FastJSONParser (orjson). Рендерится ответ списка
+постов с превью комментариев, разбираются тела пакетного создания
+постов (длинный русский текст) и комментариев (короткие строки) того же
+числа элементов.
+
+Данные генерируются в транзакции, которая в конце откатывается.
+
+    python -m benchmarks.json_rendering --rows 1000
+'''
+import argparse
+import json
+from io import BytesIO
+
+from benchmarks.common import measure, server_name, setup_django
+from benchmarks.serializers import seed
+
+
+def build_page(rows):
+    '''Данные ответа списка постов, как их отдаёт представление'''
+    from django.db.models import Prefetch
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from posts.models import Post
+    from posts.serializers import PostSerializer, latest_comments_queryset
+
+    request = Request(APIRequestFactory(
+        SERVER_NAME=server_name()
+    ).get('/api/posts/'))
+    posts = (
+        Post.objects.defer('search_vector')
+        .order_by('-created_at', '-id')
+        .prefetch_related(Prefetch(
+            'comments', queryset=latest_comments_queryset(),
+            to_attr='prefetched_latest_comments'
+        ))[:rows]
+    )
+    return {
+        'next': f'http://{server_name()}/api/posts/?cursor=cD0yMDI0',
+        'previous': None,
+        'results': PostSerializer(
+            posts, many=True, context={'request': request}
+        ).data,
+    }
+
+
+def run(page, repeat):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from posts.parsers import FastJSONParser
+    from posts.renderers import FastJSONRenderer
+
+    bodies = {
+        'posts': JSONRenderer().render([
+            {'title': post['title'], 'text': post['text']}
+            for post in page['results']
+        ]),
+        'comments': JSONRenderer().render([
+            {'post': post['id'], 'text': f'Комментарий {i}'}
+            for i, post in enumerate(page['results'])
+        ]),
+    }
+    cases = {
+        'render_json': (page, lambda: JSONRenderer().render(page)),
+        'render_orjson': (page, lambda: FastJSONRenderer().render(page)),
+    }
+    for name, body in bodies.items():
+        cases[f'parse_{name}_json'] = (
+            body, lambda body=body: JSONParser().parse(BytesIO(body))
+        )
+        cases[f'parse_{name}_orjson'] = (
+            body, lambda body=body: FastJSONParser().parse(BytesIO(body))
+        )
+    results = {}
+    for name, (data, func) in cases.items():
+        median, best = measure(func, repeat)
+        if isinstance(data, bytes):
+            size = len(data)
+        else:
+            size = len(JSONRenderer().render(data))
+        results[name] = {
+            'median_ms': round(median, 3),
+            'min_ms': round(best, 3),
+            'mb_per_second': round(size / median / 1000, 1),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--comments-per-post', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--output', help='Сохранить результаты в JSON')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import transaction
+
+    with transaction.atomic():
+        seed(args.rows, args.comments_per_post)
+        page = build_page(args.rows)
+        transaction.set_rollback(True)
+    results = run(page, args.repeat)
+
+    print(f'{"case":<24}{"median, ms":>12}{"min, ms":>12}{"MB/s":>10}')
+    for name, result in results.items():
+        print(
+            f'{name:<24}{result["median_ms"]:>12.3f}'
+            f'{result["min_ms"]:>12.3f}{result["mb_per_second"]:>10.1f}'
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'args': vars(args), 'results': results},
+                file, ensure_ascii=False, indent=2,
+            )
+
+
+if __name__ == '__main__':
+    main()
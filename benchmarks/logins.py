@@ -0,0 +1,74 @@
+'''
+Входов в секунду на одно ядро для разных хешеров паролей: проверка
+пароля отдельно и полный POST /posts/api/token/ (пользователь создаётся
+в транзакции, которая откатывается).
+
+    python -m benchmarks.logins --repeat 20
+'''
+import argparse
+
+from benchmarks.common import measure, server_name, setup_django
+
+
+HASHERS = (
+    ('pbkdf2 (Django)', 'django.contrib.auth.hashers.PBKDF2PasswordHasher'),
+    ('argon2 (Django)', 'django.contrib.auth.hashers.Argon2PasswordHasher'),
+    ('argon2 (tuned)', 'posts.hashers.TunedArgon2PasswordHasher'),
+    ('bcrypt (tuned)', 'posts.hashers.TunedBCryptSHA256PasswordHasher'),
+)
+
+PASSWORD = 'benchmark-password-1'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.hashers import check_password, make_password
+    from django.db import transaction
+    from django.test import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from posts.models import User
+
+    client = APIClient(SERVER_NAME=server_name())
+    url = reverse('token_obtain_pair')
+
+    def login():
+        response = client.post(
+            url, {'username': 'bench_login', 'password': PASSWORD}
+        )
+        assert response.status_code == 200, response.content
+
+    print(
+        f'{"hasher":<18}{"check, ms":>11}{"logins/s":>10}'
+        f'{"token, ms":>11}{"logins/s":>10}'
+    )
+    for name, hasher in HASHERS:
+        with override_settings(PASSWORD_HASHERS=[hasher]):
+            try:
+                encoded = make_password(PASSWORD)
+            except ValueError as exc:
+                print(f'{name:<18}{exc}')
+                continue
+            check_ms, _ = measure(
+                lambda: check_password(PASSWORD, encoded), args.repeat
+            )
+            with transaction.atomic():
+                User.objects.create_user(
+                    username='bench_login', password=PASSWORD,
+                    birth_date='1990-01-01'
+                )
+                token_ms, _ = measure(login, args.repeat)
+                transaction.set_rollback(True)
+        print(
+            f'{name:<18}{check_ms:>11.1f}{1000 / check_ms:>10.0f}'
+            f'{token_ms:>11.1f}{1000 / token_ms:>10.0f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+'''
+Планы и задержки горячих запросов к Post/Comment до и после индексов
+из миграции 0002_post_comment_indexes.
+
+Всё выполняется в одной транзакции, которая в конце откатывается:
+сначала генерируются данные, затем индексы удаляются (точка сохранения)
+и снимается замер «до», после отката точки сохранения — замер «после».
+
+    python -m benchmarks.query_plans --posts 200000 --comments-per-post 5
+'''
+import argparse
+import json
+from datetime import timedelta
+
+from benchmarks.common import measure, setup_django
+
+
+# Индексы, добавленные миграцией 0002_post_comment_indexes
+INDEXES = (
+    'post_created_id_idx',
+    'post_author_created_idx',
+    'comment_post_created_idx',
+    'comment_author_created_idx',
+    'comment_created_id_idx',
+)
+
+
+def seed(users, posts, comments_per_post):
+    from django.db import connection
+    from posts.models import Comment, Post, User
+
+    user_table = User._meta.db_table
+    post_table = Post._meta.db_table
+    comment_table = Comment._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            INSERT INTO {user_table} (
+                password, is_superuser, username, first_name, last_name,
+                email, is_staff, is_active, date_joined, phone, birth_date,
+                created_at, updated_at
+            )
+            SELECT '!', false, 'bench_' || i || '_' || md5(random()::text),
+                   '', '', '', false, true, now(), '', '1990-01-01',
+                   now(), now()
+            FROM generate_series(1, %s) AS i
+            RETURNING id
+            ''',
+            [users],
+        )
+        user_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            f'''
+            INSERT INTO {post_table} (
+                title, text, image_variants, author_id, created_at,
+                updated_at
+            )
+            SELECT 'Пост ' || i, repeat('Текст поста. ', 20), '{{}}',
+                   (%s::bigint[])[1 + i %% %s],
+                   now() - (%s - i) * interval '1 minute',
+                   now() - (%s - i) * interval '1 minute'
+            FROM generate_series(1, %s) AS i
+            RETURNING id
+            ''',
+            [user_ids, users, posts, posts, posts],
+        )
+        post_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            f'''
+            INSERT INTO {comment_table} (
+                text, author_id, post_id, created_at, updated_at
+            )
+            SELECT 'Комментарий ' || j,
+                   (%s::bigint[])[1 + (p.id + j) %% %s],
+                   p.id,
+                   p.created_at + j * interval '1 second',
+                   p.created_at + j * interval '1 second'
+            FROM {post_table} AS p, generate_series(1, %s) AS j
+            WHERE p.id = ANY(%s)
+            ''',
+            [user_ids, users, comments_per_post, post_ids],
+        )
+        cursor.execute(f'ANALYZE {user_table}, {post_table}, {comment_table}')
+    return user_ids, post_ids
+
+
+def hot_queries(user_ids, post_ids, page_size):
+    '''Запросы в том виде, в каком их строят представления и админка'''
+    from django.db.models import Q
+    from posts.models import Comment, Post
+
+    deep_post = Post.objects.get(pk=post_ids[len(post_ids) // 10])
+    thread_post_id = post_ids[len(post_ids) // 2]
+    author_id = user_ids[len(user_ids) // 2]
+    day_end = deep_post.created_at
+    day_start = day_end - timedelta(days=1)
+    ordering = ('-created_at', '-id')
+
+    return {
+        'post_list_first_page': (
+            Post.objects.order_by(*ordering)[:page_size]
+        ),
+        'post_list_deep_page': (
+            Post.objects.filter(
+                Q(created_at__lt=deep_post.created_at)
+                | Q(created_at=deep_post.created_at, id__lt=deep_post.id)
+            ).order_by(*ordering)[:page_size]
+        ),
+        'post_comments_thread': (
+            Comment.objects.filter(post_id=thread_post_id)
+            .order_by(*ordering)[:page_size]
+        ),
+        'posts_by_author': (
+            Post.objects.filter(author_id=author_id)
+            .order_by('-created_at')[:page_size]
+        ),
+        'comments_by_author': (
+            Comment.objects.filter(author_id=author_id)
+            .order_by('-created_at')[:page_size]
+        ),
+        'admin_post_date_range': (
+            Post.objects.filter(created_at__range=(day_start, day_end))
+            .order_by('-created_at')[:100]
+        ),
+        'admin_comment_date_range': (
+            Comment.objects.filter(created_at__range=(day_start, day_end))
+            .order_by('-created_at')[:100]
+        ),
+    }
+
+
+def run_queries(queries, repeat):
+    results = {}
+    for name, queryset in queries.items():
+        median, best = measure(lambda: list(queryset.all()), repeat)
+        results[name] = {
+            'median_ms': round(median, 3),
+            'min_ms': round(best, 3),
+            'plan': queryset.explain(analyze=True),
+        }
+    return results
+
+
+def drop_indexes():
+    from django.db import connection
+    from posts.models import Comment, Post
+
+    with connection.cursor() as cursor:
+        for name in INDEXES:
+            cursor.execute(f'DROP INDEX {name}')
+        for model in (Post, Comment):
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--comments-per-post', type=int, default=5)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Сохранить результаты в JSON')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import transaction
+
+    with transaction.atomic():
+        user_ids, post_ids = seed(
+            args.users, args.posts, args.comments_per_post
+        )
+        queries = hot_queries(user_ids, post_ids, args.page_size)
+        with transaction.atomic():
+            drop_indexes()
+            before = run_queries(queries, args.repeat)
+            transaction.set_rollback(True)
+        after = run_queries(queries, args.repeat)
+        transaction.set_rollback(True)
+
+    print(f'{"query":<28}{"before, ms":>12}{"after, ms":>12}')
+    for name in queries:
+        print(
+            f'{name:<28}{before[name]["median_ms"]:>12.3f}'
+            f'{after[name]["median_ms"]:>12.3f}'
+        )
+    for name in queries:
+        print(f'\n== {name} (до)\n{before[name]["plan"]}')
+        print(f'== {name} (после)\n{after[name]["plan"]}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'args': vars(args), 'before': before, 'after': after},
+                file, ensure_ascii=False, indent=2,
+            )
+
+
+if __name__ == '__main__':
+    main()
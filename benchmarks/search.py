@@ -0,0 +1,139 @@
+'''
+Поиск по постам: полнотекстовый (?search=, GIN-индекс по search_vector)
+против сканирования title/text через icontains.
+
+Данные генерируются в транзакции, которая в конце откатывается. В тексте
+постов — случайные слова из небольшого словаря и редкое слово в каждом
+тысячном посте, поэтому замеряются и частый, и редкий запрос.
+
+    python -m benchmarks.search --posts 1000000
+'''
+import argparse
+import json
+
+from benchmarks.common import measure, setup_django
+
+
+WORDS = (
+    'кошка', 'собака', 'погода', 'город', 'новости', 'музыка', 'футбол',
+    'программа', 'книга', 'путешествие', 'работа', 'праздник', 'кино',
+    'дорога', 'море', 'горы', 'выставка', 'концерт', 'рецепт', 'спорт',
+)
+RARE_WORD = 'вулканы'
+
+# Запрос: (слово для icontains, запрос для ?search=)
+QUERIES = {
+    'common_word': ('кошк', 'кошки'),
+    'rare_word': ('вулкан', 'вулкан'),
+    'two_words': ('кошк', 'кошки концерт'),
+}
+
+
+def seed(posts, words_per_post):
+    from django.db import connection
+    from posts.models import Post, User
+
+    author = User.objects.create_user(
+        username='bench_search', password=None, birth_date='1990-01-01'
+    )
+    table = Post._meta.db_table
+    with connection.cursor() as cursor:
+        # Вектор поиска заполняет триггер из миграции 0006_search_vector
+        cursor.execute(
+            f'''
+            INSERT INTO {table} (
+                title, text, image_variants, author_id, created_at,
+                updated_at
+            )
+            SELECT 'Пост ' || i,
+                   array_to_string(ARRAY(
+                       SELECT (%s::text[])[1 + floor(random() * %s)::int]
+                       FROM generate_series(1, %s)
+                       WHERE i IS NOT NULL
+                   ), ' ') || CASE WHEN i %% 1000 = 0
+                                   THEN ' ' || %s ELSE '' END,
+                   '{{}}', %s,
+                   now() - (%s - i) * interval '1 second',
+                   now() - (%s - i) * interval '1 second'
+            FROM generate_series(1, %s) AS i
+            ''',
+            [list(WORDS), len(WORDS), words_per_post, RARE_WORD,
+             author.pk, posts, posts, posts],
+        )
+        cursor.execute(f'ANALYZE {table}')
+
+
+def build_queries(page_size):
+    '''Первая страница так, как её строят представление и фильтр'''
+    from django.db.models import Q
+    from posts.models import Post
+    from posts.search import FullTextSearchFilter
+
+    search = FullTextSearchFilter()
+    queries = {}
+    for name, (substring, text) in QUERIES.items():
+        queries[f'{name}_icontains'] = (
+            Post.objects.filter(
+                Q(title__icontains=substring) | Q(text__icontains=substring)
+            ).order_by('-created_at', '-id')[:page_size]
+        )
+        queries[f'{name}_fulltext'] = (
+            search.filter_queryset(_Request(text), Post.objects.all(), None)
+            .order_by(*search.ordering)[:page_size]
+        )
+    return queries
+
+
+class _Request:
+    def __init__(self, search):
+        self.query_params = {'search': search}
+
+
+def run_queries(queries, repeat):
+    results = {}
+    for name, queryset in queries.items():
+        median, best = measure(lambda: list(queryset.all()), repeat)
+        results[name] = {
+            'median_ms': round(median, 3),
+            'min_ms': round(best, 3),
+            'plan': queryset.explain(analyze=True),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=1000000)
+    parser.add_argument('--words-per-post', type=int, default=30)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help='Сохранить результаты в JSON')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import transaction
+
+    with transaction.atomic():
+        seed(args.posts, args.words_per_post)
+        results = run_queries(build_queries(args.page_size), args.repeat)
+        transaction.set_rollback(True)
+
+    print(f'{"query":<24}{"median, ms":>12}{"min, ms":>12}')
+    for name, result in results.items():
+        print(
+            f'{name:<24}{result["median_ms"]:>12.3f}'
+            f'{result["min_ms"]:>12.3f}'
+        )
+    for name, result in results.items():
+        print(f'\n== {name}\n{result["plan"]}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'args': vars(args), 'results': results},
+                file, ensure_ascii=False, indent=2,
+            )
+
+
+if __name__ == '__main__':
+    main()
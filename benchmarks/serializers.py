@@ -0,0 +1,132 @@
+'''
+Сериализация страницы постов: ModelSerializer по экземплярам моделей
+против плана posts.fast.ReadPlan по строкам values(). Замеряются чтение
+страницы вместе с превью комментариев и отдельно сериализация уже
+прочитанных строк; результат — строк в секунду на одно ядро (процесс
+однопоточный).
+
+Данные генерируются в транзакции, которая в конце откатывается.
+
+    python -m benchmarks.serializers --page-sizes 20 100 500
+'''
+import argparse
+import json
+
+from benchmarks.common import measure, server_name, setup_django
+
+
+def seed(posts, comments_per_post):
+    from posts.models import Comment, Post, User
+
+    author = User.objects.create_user(
+        username='bench_serializers', password=None, birth_date='1990-01-01'
+    )
+    image = 'post_images/bench.png'
+    variants = {
+        'source': image,
+        'files': {
+            'small': 'post_images/variants/bench_small.webp',
+            'medium': 'post_images/variants/bench_medium.webp',
+        },
+    }
+    created = Post.objects.bulk_create([
+        Post(
+            author=author, title=f'Пост {i}', text='Текст поста ' * 50,
+            image=image if i % 2 else None,
+            image_variants=variants if i % 2 else {},
+            comment_count=comments_per_post,
+        )
+        for i in range(posts)
+    ])
+    Comment.objects.bulk_create([
+        Comment(author=author, post=post, text=f'Комментарий {i}')
+        for post in created for i in range(comments_per_post)
+    ])
+
+
+def build_paths(page_size):
+    '''Оба пути чтения первой страницы, как их выполняет представление'''
+    from django.db.models import Prefetch
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from posts.fast import ReadPlan
+    from posts.models import Post
+    from posts.serializers import PostSerializer, latest_comments_queryset
+
+    request = Request(APIRequestFactory(
+        SERVER_NAME=server_name()
+    ).get('/api/posts/'))
+    context = {'request': request}
+    page = Post.objects.defer('search_vector').order_by('-created_at', '-id')
+
+    def instances():
+        return list(page.prefetch_related(Prefetch(
+            'comments', queryset=latest_comments_queryset(),
+            to_attr='prefetched_latest_comments'
+        ))[:page_size])
+
+    plan = ReadPlan(PostSerializer(context=context))
+
+    def rows():
+        return list(page.values(*plan.columns)[:page_size])
+
+    loaded_instances = instances()
+    loaded_rows = rows()
+    return {
+        'serializer': lambda: PostSerializer(
+            instances(), many=True, context=context
+        ).data,
+        'plan': lambda: plan.serialize(rows()),
+        'serializer_cpu': lambda: PostSerializer(
+            loaded_instances, many=True, context=context
+        ).data,
+        # Превью комментариев в плане читается запросом внутри serialize
+        'plan_cpu': lambda: plan.serialize(loaded_rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--comments-per-post', type=int, default=5)
+    parser.add_argument(
+        '--page-sizes', type=int, nargs='+', default=[20, 100, 500]
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Сохранить результаты в JSON')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import transaction
+
+    results = {}
+    with transaction.atomic():
+        seed(args.posts, args.comments_per_post)
+        for page_size in args.page_sizes:
+            rows = min(page_size, args.posts)
+            for name, func in build_paths(page_size).items():
+                median, best = measure(func, args.repeat)
+                results[f'{name}_{page_size}'] = {
+                    'median_ms': round(median, 3),
+                    'min_ms': round(best, 3),
+                    'rows_per_second': round(rows / median * 1000),
+                }
+        transaction.set_rollback(True)
+
+    print(f'{"path":<24}{"median, ms":>12}{"min, ms":>12}{"rows/s":>12}')
+    for name, result in results.items():
+        print(
+            f'{name:<24}{result["median_ms"]:>12.3f}'
+            f'{result["min_ms"]:>12.3f}{result["rows_per_second"]:>12}'
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'args': vars(args), 'results': results},
+                file, ensure_ascii=False, indent=2,
+            )
+
+
+if __name__ == '__main__':
+    main()
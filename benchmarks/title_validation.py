@@ -0,0 +1,89 @@
+'''
+Стоимость проверки заголовка на запрещённые слова в зависимости от
+размера списка: прежний цикл с re.search на каждое слово против
+WordMatcher, собранного один раз по префиксному дереву.
+
+    python -m benchmarks.title_validation --sizes 3 1000 10000 50000
+'''
+import argparse
+import random
+import re
+import time
+
+from benchmarks.common import measure, setup_django
+
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+TITLES = [
+    'Как я провёл лето на даче у бабушки в деревне',
+    'Обзор новых возможностей языка программирования',
+    'Десять советов начинающему фотографу',
+]
+
+
+def random_words(count, rng):
+    words = set()
+    while len(words) < count:
+        length = rng.randint(4, 12)
+        words.add(''.join(rng.choice(ALPHABET) for _ in range(length)))
+    return list(words)
+
+
+def loop_search(words, title):
+    '''Прежняя реализация validate_post_title'''
+    lower_title = title.lower()
+    for word in words:
+        if re.search(rf'\b{re.escape(word)}\b', lower_title):
+            return word
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[3, 100, 1000, 10000, 50000]
+    )
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument(
+        '--loop-limit', type=int, default=10000,
+        help='Не замерять прежний цикл для списков длиннее'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from posts.moderation import WordMatcher
+
+    rng = random.Random(args.seed)
+    print(
+        f'{"words":>8}{"build, ms":>12}'
+        f'{"matcher, µs":>14}{"loop, µs":>14}'
+    )
+    for size in args.sizes:
+        words = random_words(size, rng)
+
+        started = time.perf_counter()
+        matcher = WordMatcher(words)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        def run_matcher():
+            for title in TITLES:
+                matcher.search(title)
+
+        matcher_ms, _ = measure(run_matcher, args.repeat)
+        loop = '-'
+        if size <= args.loop_limit:
+            loop_ms, _ = measure(
+                lambda: [loop_search(words, title) for title in TITLES],
+                max(1, args.repeat // 20)
+            )
+            loop = f'{loop_ms * 1000 / len(TITLES):.1f}'
+        print(
+            f'{size:>8}{build_ms:>12.1f}'
+            f'{matcher_ms * 1000 / len(TITLES):>14.1f}{loop:>14}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Gunicorn config for config project.
+
+Worker count and threads come from the environment, so one image can
+use every core of whatever host it runs on:
+
+    gunicorn config.wsgi:application -c config/gunicorn.conf.py
+
+`kill -HUP <master pid>` reloads code and config gracefully: new workers
+are started before the old ones finish their in-flight requests.
+"""
+
+import multiprocessing
+import os
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+workers = int(os.getenv(
+    'WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1
+))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+
+# При SERVER_MODE=asgi entrypoint.sh задаёт GUNICORN_WORKER_CLASS воркера
+# uvicorn
+worker_class = os.getenv(
+    'GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync'
+)
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Перезапуск воркеров после N запросов ограничивает рост памяти
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
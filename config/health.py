@@ -0,0 +1,46 @@
+"""
+Liveness and readiness probes.
+
+Liveness only says the process answers; readiness also checks the
+database and the cache, so a load balancer stops routing to a worker
+that cannot serve requests. Errors go to the log only: the probes are
+anonymous, and exception text can name database hosts and users.
+"""
+
+import logging
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+def liveness(request):
+    return JsonResponse({'status': 'ok'})
+
+
+def readiness(request):
+    checks = {}
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        checks['database'] = 'ok'
+    except DatabaseError:
+        logger.exception('Readiness: database check failed')
+        checks['database'] = 'unavailable'
+
+    try:
+        cache.set('health:ready', 1, timeout=5)
+        ok = cache.get('health:ready') == 1
+        checks['cache'] = 'ok' if ok else 'unavailable'
+    except Exception:
+        logger.exception('Readiness: cache check failed')
+        checks['cache'] = 'unavailable'
+
+    ready = all(value == 'ok' for value in checks.values())
+    return JsonResponse(
+        {'status': 'ok' if ready else 'unavailable', 'checks': checks},
+        status=200 if ready else 503
+    )
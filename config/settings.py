@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'posts',
@@ -60,15 +61,72 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # Бэкенд postgresql с CONN_HEALTH_CHECKS из Django 4.1
+        'ENGINE': 'posts.db',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Секунды жизни соединения между запросами, 0 — закрывать сразу
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # Проверять переиспользуемое соединение при первом обращении к БД
+        # в запросе (posts.db, в Django 4.1+ встроено)
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS') in [
+            '1', 'True', 'true'
+        ],
+        # pgbouncer в режиме transaction не поддерживает курсоры на сервере
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+            'DB_DISABLE_SERVER_SIDE_CURSORS'
+        ) in ['1', 'True', 'true'],
     }
 }
 
+# Реплика для чтения: безопасные запросы к API читают из неё
+# (posts.replicas). Не заданные DB_REPLICA_* параметры берутся у основной БД
+DATABASE_REPLICAS = []
+if os.getenv('DB_REPLICA_HOST'):
+    default = DATABASES['default']
+    DATABASES['replica'] = {
+        **default,
+        'NAME': os.getenv('DB_REPLICA_NAME', default['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', default['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', default['PASSWORD']),
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', default['PORT']),
+        # В тестах реплика смотрит в тестовую копию основной БД
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append('replica')
+
+DATABASE_ROUTERS = ['posts.replicas.PrimaryReplicaRouter']
+
+# Сколько секунд после записи клиент читает из основной БД, а не из
+# отстающей реплики
+POSTS_PRIMARY_PIN_SECONDS = int(os.getenv('POSTS_PRIMARY_PIN_SECONDS', 5))
+
+# Новые пароли хешируются первым хешером списка (PASSWORD_HASHER), по
+# остальным проверяются старые хеши; при входе они пересчитываются
+PASSWORD_HASHER_CHOICES = {
+    'argon2': 'posts.hashers.TunedArgon2PasswordHasher',
+    'bcrypt': 'posts.hashers.TunedBCryptSHA256PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = PASSWORD_HASHER_CHOICES[
+    os.getenv('PASSWORD_HASHER', 'argon2')
+]
+PASSWORD_HASHERS = [PASSWORD_HASHER] + [
+    hasher for hasher in [
+        *PASSWORD_HASHER_CHOICES.values(),
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ]
+    if hasher != PASSWORD_HASHER
+]
+POSTS_ARGON2_TIME_COST = int(os.getenv('POSTS_ARGON2_TIME_COST', 2))
+POSTS_ARGON2_MEMORY_COST = int(os.getenv('POSTS_ARGON2_MEMORY_COST', 19456))
+POSTS_ARGON2_PARALLELISM = int(os.getenv('POSTS_ARGON2_PARALLELISM', 1))
+POSTS_BCRYPT_ROUNDS = int(os.getenv('POSTS_BCRYPT_ROUNDS', 12))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -101,17 +159,118 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Раздача медиафайлов (posts.media): '' — сам Django через FileResponse,
+# nginx — X-Accel-Redirect на internal-локацию POSTS_MEDIA_ACCEL_PREFIX,
+# sendfile — X-Sendfile (Apache, lighttpd)
+POSTS_MEDIA_ACCEL = os.getenv('POSTS_MEDIA_ACCEL', '')
+POSTS_MEDIA_ACCEL_PREFIX = os.getenv(
+    'POSTS_MEDIA_ACCEL_PREFIX', '/protected-media/'
+)
+POSTS_MEDIA_PUBLIC_PREFIXES = ('post_images/',)
+# Кеширование файлов, имя которых не содержит хеш содержимого, секунды
+POSTS_MEDIA_MAX_AGE = int(os.getenv('POSTS_MEDIA_MAX_AGE', 3600))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'posts.authentication.StatelessJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # JSON через orjson, если он установлен (extra orjson)
+    'DEFAULT_RENDERER_CLASSES': [
+        'posts.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'posts.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Кеш: Redis (пакет django-redis) в продакшене, память процесса локально
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Кеш страниц списков для анонимных запросов
+POSTS_CACHE_ALIAS = 'default'
+# Кеш общий для всех воркеров. Только тогда работают кеш страниц и ETag
+# списков по поколениям: у LocMem в каждом процессе свои поколения
+POSTS_CACHE_SHARED = bool(REDIS_URL)
+POSTS_CACHE_TIMEOUT = int(os.getenv('POSTS_CACHE_TIMEOUT', 60))
+
+# Как часто процесс сверяет версию списков модерации в базе, секунды
+POSTS_MODERATION_REFRESH_INTERVAL = float(
+    os.getenv('POSTS_MODERATION_REFRESH_INTERVAL', 5)
+)
+
+# Пакетные создание и изменение (POST и PATCH .../bulk/)
+POSTS_BULK_MAX_ITEMS = int(os.getenv('POSTS_BULK_MAX_ITEMS', 1000))
+POSTS_BULK_BATCH_SIZE = int(os.getenv('POSTS_BULK_BATCH_SIZE', 500))
+
+# Потоки, в которых async-представления выполняют запросы к БД. Каждый
+# поток держит своё соединение: не больше потоков, чем позволяет БД
+POSTS_ASYNC_THREADS = int(os.getenv('POSTS_ASYNC_THREADS', 20))
+
+# Как часто процесс сверяет активность и is_staff владельца JWT, секунды
+POSTS_JWT_USER_CHECK_INTERVAL = float(
+    os.getenv('POSTS_JWT_USER_CHECK_INTERVAL', 30)
+)
+
+# Фоновая обработка изображений постов (posts.images): очередь db
+# (команда process_images), thread (пул потоков процесса) или immediate
+POSTS_IMAGE_QUEUE = os.getenv('POSTS_IMAGE_QUEUE', 'db')
+# Варианты: имя -> наибольшие ширина и высота
+POSTS_IMAGE_VARIANTS = {
+    'thumbnail': (320, 320),
+    'web': (1280, 1280),
+}
+POSTS_IMAGE_FORMAT = os.getenv('POSTS_IMAGE_FORMAT', 'WEBP')
+POSTS_IMAGE_QUALITY = int(os.getenv('POSTS_IMAGE_QUALITY', 80))
+POSTS_IMAGE_MAX_ATTEMPTS = 3
+# Пауза перед повтором задачи после ошибки, секунды; удваивается с каждой
+POSTS_IMAGE_RETRY_DELAY = float(os.getenv('POSTS_IMAGE_RETRY_DELAY', 30))
+# Ограничения загрузки: размер файла и число пикселей по заголовку
+POSTS_IMAGE_MAX_BYTES = int(
+    os.getenv('POSTS_IMAGE_MAX_BYTES', 10 * 1024 * 1024)
+)
+POSTS_IMAGE_MAX_PIXELS = int(os.getenv('POSTS_IMAGE_MAX_PIXELS', 40_000_000))
+
+# Загружаемые файлы пишутся на диск частями (posts.uploads), а не держатся
+# в памяти; при сохранении в MEDIA_ROOT файл перемещается без копирования
+FILE_UPLOAD_HANDLERS = [
+    'posts.uploads.StreamingImageUploadHandler',
+]
+
+# Курсорная пагинация списков постов и комментариев
+POSTS_PAGE_SIZE = int(os.getenv('POSTS_PAGE_SIZE', 20))
+POSTS_MAX_PAGE_SIZE = int(os.getenv('POSTS_MAX_PAGE_SIZE', 100))
+# ?search= сортирует по релевантности, только если совпадений не больше
+# этого числа; иначе — новые сначала, без ts_rank по каждому совпадению
+POSTS_SEARCH_RANK_LIMIT = int(os.getenv('POSTS_SEARCH_RANK_LIMIT', 5000))
+
+# Длина text_preview (?fields=text_preview) в символах
+POSTS_TEXT_PREVIEW_LENGTH = int(os.getenv('POSTS_TEXT_PREVIEW_LENGTH', 200))
+
+# Списки из values() по плану полей (posts.fast), без ModelSerializer
+POSTS_FAST_READ = os.getenv('POSTS_FAST_READ', '1') in ['1', 'True', 'true']
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Posts API',
     'DESCRIPTION': 'Документация к API постов и комментариев',
@@ -126,5 +285,12 @@ from datetime import timedelta
 SIMPLE_JWT = {
   'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
   'AUTH_HEADER_TYPES': ('Bearer',),
+  # Принимаются и обычные access-токены, и скользящие
+  'AUTH_TOKEN_CLASSES': (
+    'rest_framework_simplejwt.tokens.AccessToken',
+    'rest_framework_simplejwt.tokens.SlidingToken',
+  ),
+  # Приложение token_blacklist не подключено, refresh-токены не ротируются
+  'BLACKLIST_AFTER_ROTATION': False,
 }
 
@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.urls import path, include
 
 from django.conf import settings
-from django.conf.urls.static import static
+
+from config.health import liveness, readiness
+from posts.media import serve_media
 
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -13,6 +15,8 @@ from drf_spectacular.views import (
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('health/live/', liveness, name='health_live'),
+    path('health/ready/', readiness, name='health_ready'),
     path('posts/', include('posts.urls')),
     path('schema/', SpectacularAPIView.as_view(), name='schema'),
     path(
@@ -25,11 +29,9 @@ urlpatterns = [
         SpectacularRedocView.as_view(url_name='schema'),
         name='redoc'
     ),
+    path(
+        f'{settings.MEDIA_URL.lstrip("/")}<path:path>',
+        serve_media,
+        name='media'
+    ),
 ]
-
-
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT
-    )
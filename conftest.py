@@ -0,0 +1,18 @@
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'replica: тест не отключает чтение из реплик'
+    )
+
+
+@pytest.fixture(autouse=True)
+def primary_only(request, settings):
+    '''
+    Тесты читают из основной БД: реплика в тестах — зеркало основной
+    базы через отдельное соединение, и данные из транзакции TestCase
+    через него не видны.
+    '''
+    if request.node.get_closest_marker('replica') is None:
+        settings.DATABASE_REPLICAS = []
@@ -9,11 +9,29 @@ while ! nc -z db 5432; do
 done
 echo "PostgreSQL started"
 
+# Воркер очереди изображений: миграции применяет контейнер web
+if [ "$SERVER_MODE" = "worker" ]; then
+  exec python manage.py process_images
+fi
+
 # Применяем миграции
 python manage.py migrate
 
-# Загружаем тестовые данные
-python manage.py create_test_data
+# Тестовые данные загружаются только по запросу
+if [ "$SEED_TEST_DATA" = "1" ]; then
+  python manage.py create_test_data
+fi
 
-# Запускаем сервер
-python manage.py runserver 0.0.0.0:8000
+# Запускаем сервер: exec, чтобы сигналы (HUP, TERM) получал gunicorn
+case "${SERVER_MODE:-wsgi}" in
+  dev)
+    exec python manage.py runserver 0.0.0.0:8000
+    ;;
+  asgi)
+    export GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker
+    exec gunicorn config.asgi:application -c config/gunicorn.conf.py
+    ;;
+  *)
+    exec gunicorn config.wsgi:application -c config/gunicorn.conf.py
+    ;;
+esac
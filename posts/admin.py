@@ -1,23 +1,31 @@
 from django.contrib import admin
 from rangefilter.filters import DateRangeFilter  # календарный фильтр
-from .models import User, Post, Comment
+from .models import (User, Post, Comment, AllowedEmailDomain,
+                     BannedTitleWord, ImageTask)
 from django.utils.html import format_html
 from django.urls import reverse
 
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
-    list_display = ('id', 'username', 'email', 'phone', 'birth_date')
+    list_display = (
+        'id', 'username', 'email', 'phone', 'birth_date', 'post_count',
+        'comment_count'
+    )
     search_fields = ('username', 'email')
 
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('id', 'title', 'author_link', 'created_at')
+    list_display = (
+        'id', 'title', 'author_link', 'comment_count', 'created_at'
+    )
     list_filter = (('created_at', DateRangeFilter),)
+    list_select_related = ('author',)
+    raw_id_fields = ('author',)
 
     def author_link(self, obj):
-        url = reverse('admin:posts_user_change', args=[obj.author.id])
+        url = reverse('admin:posts_user_change', args=[obj.author_id])
         return format_html('<a href="{}">{}</a>', url, obj.author.username)
 
     author_link.short_description = 'Автор'
@@ -27,3 +35,25 @@ class PostAdmin(admin.ModelAdmin):
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('id', 'post', 'author', 'created_at')
     list_filter = (('created_at', DateRangeFilter),)  # календарный фильтр
+    # str(post) обращается к автору поста
+    list_select_related = ('post__author', 'author')
+    raw_id_fields = ('post', 'author')
+
+
+@admin.register(AllowedEmailDomain)
+class AllowedEmailDomainAdmin(admin.ModelAdmin):
+    list_display = ('id', 'domain')
+    search_fields = ('domain',)
+
+
+@admin.register(BannedTitleWord)
+class BannedTitleWordAdmin(admin.ModelAdmin):
+    list_display = ('id', 'word')
+    search_fields = ('word',)
+
+
+@admin.register(ImageTask)
+class ImageTaskAdmin(admin.ModelAdmin):
+    list_display = ('id', 'post', 'status', 'attempts', 'created_at')
+    list_filter = ('status',)
+    raw_id_fields = ('post',)
@@ -0,0 +1,55 @@
+'''
+Async-представления для чтения постов и комментариев под ASGI.
+
+В Django 3.2 нет асинхронного ORM, а синхронные представления под ASGI
+выполняются по очереди в одном общем потоке. Здесь действия вьюсетов
+выносятся в отдельный пул потоков: медленные клиенты не занимают
+воркер, а запросы к БД идут параллельно.
+'''
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.response import SimpleTemplateResponse
+
+from posts.views import CommentViewSet, PostViewSet
+
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.POSTS_ASYNC_THREADS,
+    thread_name_prefix='posts-async'
+)
+
+
+def async_action(viewset, actions):
+    '''Async-обёртка над действиями вьюсета, например {'get': 'list'}'''
+    view = viewset.as_view(actions)
+
+    def run(request, *args, **kwargs):
+        # Сигналы request_started/finished закрывают соединения только в
+        # потоке обработчика. Соединения потока пула закрываются после
+        # каждого вызова: иначе каждый из POSTS_ASYNC_THREADS потоков
+        # держал бы своё соединение сверх соединений воркеров
+        try:
+            response = view(request, *args, **kwargs)
+            # Рендерим здесь же, чтобы не возвращаться в цикл событий
+            if isinstance(response, SimpleTemplateResponse):
+                response.render()
+            return response
+        finally:
+            connections.close_all()
+
+    offloaded = sync_to_async(run, thread_sensitive=False, executor=executor)
+
+    async def async_view(request, *args, **kwargs):
+        return await offloaded(request, *args, **kwargs)
+
+    async_view.csrf_exempt = True
+    return async_view
+
+
+post_list = async_action(PostViewSet, {'get': 'list'})
+post_detail = async_action(PostViewSet, {'get': 'retrieve'})
+comment_list = async_action(CommentViewSet, {'get': 'list'})
+comment_detail = async_action(CommentViewSet, {'get': 'retrieve'})
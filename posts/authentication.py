@@ -0,0 +1,100 @@
+import threading
+import time
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+User = get_user_model()
+
+# Утверждения access-токена, которых хватает сериализаторам и правам
+USER_CLAIMS = ('is_staff', 'birth_date')
+
+
+def user_claims(user):
+    return {
+        'is_staff': user.is_staff,
+        'birth_date': user.birth_date.isoformat(),
+    }
+
+
+class ClaimsUser(TokenUser):
+    '''Пользователь, собранный из утверждений токена, без запроса к БД'''
+
+    @cached_property
+    def birth_date(self):
+        return date.fromisoformat(self.token['birth_date'])
+
+
+class ActiveUsers:
+    '''
+    Кеш процесса: (is_active, is_staff) пользователя или None, если его
+    нет. Проверка отзыва доступа (деактивация, удаление, снятие прав
+    администратора) выполняется не чаще раза в ttl секунд.
+    '''
+
+    # Сверх этого числа записей устаревшие выбрасываются
+    max_size = 10000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked = {}
+
+    def get_state(self, user_id):
+        ttl = settings.POSTS_JWT_USER_CHECK_INTERVAL
+        now = time.monotonic()
+        with self.lock:
+            cached = self.checked.get(user_id)
+        if cached is not None and now - cached[1] < ttl:
+            return cached[0]
+
+        state = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values_list('is_active', 'is_staff').first()
+        with self.lock:
+            if len(self.checked) >= self.max_size:
+                self.checked = {
+                    key: value for key, value in self.checked.items()
+                    if now - value[1] < ttl
+                }
+            self.checked[user_id] = (state, now)
+        return state
+
+    def clear(self):
+        with self.lock:
+            self.checked.clear()
+
+
+active_users = ActiveUsers()
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    '''
+    Пользователь строится из утверждений токена (id, is_staff,
+    birth_date) вместо загрузки строки User на каждый запрос. Токены,
+    выданные без этих утверждений, обрабатываются как раньше — через БД.
+    Если is_staff в базе уже другой, пользователь тоже загружается из БД:
+    права не переживают изменение в админке дольше интервала проверки.
+    '''
+
+    def get_user(self, validated_token):
+        claims = (api_settings.USER_ID_CLAIM, *USER_CLAIMS)
+        if not all(claim in validated_token for claim in claims):
+            return super().get_user(validated_token)
+
+        user = ClaimsUser(validated_token)
+        state = active_users.get_state(user.id)
+        if state is None or not state[0]:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        if state[1] != user.is_staff:
+            return super().get_user(validated_token)
+        return user
@@ -0,0 +1,210 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import (APIException, PermissionDenied,
+                                       ValidationError)
+from rest_framework.fields import get_error_detail
+from rest_framework.response import Response
+
+from posts import counters
+
+
+def parse_pk(value):
+    '''Ключ из JSON: целое или строка из ASCII-цифр, иначе None'''
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    # isdigit() пропускает и не-ASCII цифры вроде '²'
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    return None
+
+
+class BulkWriteMixin:
+    '''
+    POST <список>/bulk/ — пакетное создание объектов одним запросом,
+    PATCH <список>/bulk/ — пакетное изменение ([{"id": 1, ...}, ...]).
+
+    При создании права автора проверяются один раз, элементы валидируются
+    одним экземпляром сериализатора и сохраняются через bulk_create. При
+    изменении объекты читаются одним запросом, права проверяются по
+    каждому, изменения пишутся через bulk_update. Всё — в одной
+    транзакции, в ответе результат по каждому элементу.
+    '''
+    bulk_max_items = settings.POSTS_BULK_MAX_ITEMS
+
+    def get_bulk_serializer_context(self, items):
+        context = self.get_serializer_context()
+        context['bulk'] = True
+        return context
+
+    def build_bulk_instance(self, validated_data):
+        model = self.get_serializer_class().Meta.model
+        return model(author_id=self.request.user.id, **validated_data)
+
+    def after_bulk_create(self, instances):
+        '''Действия, которые при обычном save() выполняют сигналы'''
+
+    def after_bulk_update(self, instances):
+        '''
+        То же для изменения. В instance._counter_keys ещё ключи до
+        изменения
+        '''
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({
+                'non_field_errors': ['Ожидается непустой список объектов']
+            })
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({'non_field_errors': [
+                f'Не больше {self.bulk_max_items} объектов за запрос'
+            ]})
+        return items
+
+    def bulk_response(self, verb, items, results, instances, success):
+        data = iter(self.get_serializer(instances, many=True).data)
+        for result in results:
+            if 'instance' in result:
+                del result['instance']
+                result['data'] = next(data)
+
+        if not instances:
+            status_code = status.HTTP_400_BAD_REQUEST
+        elif len(instances) < len(items):
+            status_code = status.HTTP_207_MULTI_STATUS
+        else:
+            status_code = success
+        return Response(
+            {
+                verb: len(instances),
+                'failed': len(items) - len(instances),
+                'results': results,
+            },
+            status=status_code
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        items = self.get_bulk_items(request)
+        try:
+            self.get_serializer_class().check_author(request.user)
+        except DjangoValidationError as exc:
+            raise ValidationError({'non_field_errors': get_error_detail(exc)})
+
+        serializer = self.get_serializer(
+            context=self.get_bulk_serializer_context(items)
+        )
+        results = []
+        instances = []
+        for index, item in enumerate(items):
+            try:
+                validated_data = serializer.run_validation(item)
+            except ValidationError as exc:
+                results.append({'index': index, 'errors': exc.detail})
+                continue
+            instance = self.build_bulk_instance(validated_data)
+            instances.append(instance)
+            results.append({'index': index, 'instance': instance})
+
+        model = self.get_serializer_class().Meta.model
+        with transaction.atomic():
+            model.objects.bulk_create(
+                instances, batch_size=settings.POSTS_BULK_BATCH_SIZE
+            )
+            # bulk_create не отправляет post_save: счётчики — здесь, по
+            # запросу на каждое значение приращения
+            counters.created(model, instances)
+            self.after_bulk_create(instances)
+
+        return self.bulk_response(
+            'created', items, results, instances, status.HTTP_201_CREATED
+        )
+
+    def get_bulk_object(self, item, objects, seen):
+        '''Объект для элемента PATCH; ошибки — ValidationError элемента'''
+        if not isinstance(item, dict):
+            raise ValidationError({
+                'non_field_errors': ['Ожидается объект с полем id']
+            })
+        pk = parse_pk(item.get('id'))
+        if pk is None:
+            raise ValidationError({'id': ['Ожидается целый id объекта']})
+        if pk in seen:
+            raise ValidationError({
+                'id': ['Объект уже изменён в этом запросе']
+            })
+        if pk not in objects:
+            raise ValidationError({'id': [f'Объект {pk} не найден']})
+        instance = objects[pk]
+        try:
+            self.check_object_permissions(self.request, instance)
+        except APIException as exc:
+            raise ValidationError({'non_field_errors': [exc.detail]})
+        seen.add(pk)
+        return instance
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        if not request.user.is_authenticated:
+            raise PermissionDenied('Учетные данные не предоставлены')
+        items = self.get_bulk_items(request)
+        ids = {
+            parse_pk(item.get('id')) for item in items
+            if isinstance(item, dict)
+        }
+        ids.discard(None)
+        # Объекты всех элементов одним запросом
+        objects = self.get_queryset().in_bulk(ids)
+        context = self.get_bulk_serializer_context(items)
+
+        results = []
+        instances = []
+        fields = set()
+        seen = set()
+        for index, item in enumerate(items):
+            try:
+                instance = self.get_bulk_object(item, objects, seen)
+                serializer = self.get_serializer(
+                    instance, data=item, partial=True, context=context
+                )
+                serializer.is_valid(raise_exception=True)
+            except ValidationError as exc:
+                results.append({'index': index, 'errors': exc.detail})
+                continue
+            for name, value in serializer.validated_data.items():
+                setattr(instance, name, value)
+                fields.add(name)
+            instances.append(instance)
+            results.append({'index': index, 'instance': instance})
+
+        model = self.get_serializer_class().Meta.model
+        # bulk_update не вызывает save(): auto_now заполняется здесь
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                fields.add(field.name)
+                for instance in instances:
+                    field.pre_save(instance, False)
+
+        with transaction.atomic():
+            if instances:
+                model.objects.bulk_update(
+                    instances, fields,
+                    batch_size=settings.POSTS_BULK_BATCH_SIZE
+                )
+            # Комментарии, перенесённые к другим постам, и их счётчики
+            counters.moved_many(model, [
+                (instance._counter_keys, counters.tracked_keys(instance))
+                for instance in instances
+            ])
+            self.after_bulk_update(instances)
+        for instance in instances:
+            instance._counter_keys = counters.tracked_keys(instance)
+
+        return self.bulk_response(
+            'updated', items, results, instances, status.HTTP_200_OK
+        )
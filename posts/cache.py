@@ -0,0 +1,134 @@
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from posts.replicas import primary_reads
+
+
+HITS_KEY = 'posts:cache:hits'
+MISSES_KEY = 'posts:cache:misses'
+
+# Страницы /posts/<id>/comments/ зависят от поколения своего поста, а
+# общее поколение сбрасывают только массовые операции (create_test_data)
+POST_COMMENTS = 'post-comments'
+
+
+def get_cache():
+    return caches[settings.POSTS_CACHE_ALIAS]
+
+
+def _generation_key(namespace):
+    return f'posts:generation:{namespace}'
+
+
+def _bump(namespaces):
+    get_cache().set_many(
+        {_generation_key(name): uuid4().hex for name in namespaces},
+        timeout=None
+    )
+
+
+def invalidate(*namespaces):
+    '''
+    Сбрасывает все закешированные страницы, зависящие от namespaces.
+    Поколение меняется сразу и ещё раз после коммита, чтобы страница,
+    собранная конкурентным запросом до коммита, не осталась в кеше.
+    '''
+    _bump(namespaces)
+    transaction.on_commit(lambda: _bump(namespaces))
+
+
+def post_comments_namespaces(post_id):
+    return (POST_COMMENTS, f'{POST_COMMENTS}:{post_id}')
+
+
+def invalidate_comments(*post_ids):
+    '''
+    Запись комментариев: сбрасываются списки комментариев (и постов, где
+    есть их счётчик и превью) и страницы комментариев только этих постов
+    '''
+    invalidate('comments', *(
+        f'{POST_COMMENTS}:{pk}' for pk in set(post_ids) if pk is not None
+    ))
+
+
+def get_generations(namespaces):
+    cache = get_cache()
+    keys = [_generation_key(name) for name in namespaces]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, uuid4().hex, timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def list_cache_key(namespaces, request):
+    # В ответе абсолютные ссылки next/previous, поэтому ключ — полный URI
+    uri = md5(request.build_absolute_uri().encode()).hexdigest()
+    generations = ':'.join(get_generations(namespaces))
+    return f'posts:list:{generations}:{uri}'
+
+
+def _increment(key):
+    cache = get_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Ключ вытеснили между add и incr
+        cache.set(key, 1, timeout=None)
+
+
+def get_stats():
+    stats = get_cache().get_many([HITS_KEY, MISSES_KEY])
+    return {
+        'hits': stats.get(HITS_KEY, 0),
+        'misses': stats.get(MISSES_KEY, 0),
+    }
+
+
+class CachedListMixin:
+    '''
+    Кеширует сериализованные страницы списков для анонимных запросов.
+    cache_namespaces — модели, от изменения которых зависит страница.
+
+    Только с общим кешем (POSTS_CACHE_SHARED): иначе запись в одном
+    воркере не сбросит страницы в остальных. Страница собирается из
+    основной БД — реплика может ещё не видеть запись, сменившую поколение.
+    '''
+    cache_namespaces = ()
+
+    def cached_response(self, request, build_response, namespaces=None):
+        if not (request.user.is_anonymous and settings.POSTS_CACHE_SHARED):
+            return build_response()
+
+        cache = get_cache()
+        if namespaces is None:
+            namespaces = self.cache_namespaces
+        key = list_cache_key(namespaces, request)
+        data = cache.get(key)
+        if data is not None:
+            _increment(HITS_KEY)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _increment(MISSES_KEY)
+        with primary_reads():
+            response = build_response()
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.POSTS_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(CachedListMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
@@ -0,0 +1,106 @@
+from calendar import timegm
+from hashlib import md5
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from posts.cache import get_generations
+from posts.replicas import primary_reads, replica_reads
+
+
+def make_etag(*parts):
+    return quote_etag(md5(repr(parts).encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    '''
+    ETag/Last-Modified для list и retrieve: при совпадении валидаторов
+    отвечаем 304, не выполняя выборку страницы и сериализацию.
+    Методы get_*_validators возвращают пару (версия, last_modified):
+    из версии строится ETag, last_modified может быть None.
+
+    ETag списка строится из URI и поколений кеша cache_namespaces
+    (posts.cache), которые меняются при каждой записи: проверка не делает
+    запросов к БД, а страница с таким ETag собирается из основной БД.
+    Если поколения не общие (POSTS_CACHE_SHARED) или запрос читает из
+    реплики без кеша страниц, ETag — хеш содержимого: 304 экономит только
+    передачу ответа. Без cache_namespaces список отдаётся без ETag.
+    '''
+    cache_namespaces = ()
+
+    def use_generation_etag(self):
+        if not settings.POSTS_CACHE_SHARED:
+            return False
+        # Анонимные страницы и так кешируются из основной БД
+        return self.request.user.is_anonymous or not replica_reads()
+
+    def get_list_validators(self):
+        # Last-Modified у списка нет: поколение — не момент времени
+        generations = get_generations(self.cache_namespaces)
+        return (self.request.get_full_path(), generations), None
+
+    def get_object_validators(self, obj):
+        return (obj.pk, obj.updated_at), obj.updated_at
+
+    def conditional_response(self, request, version, last_modified, build):
+        headers = HttpResponse()
+        headers['ETag'] = make_etag(version, request.accepted_renderer.format)
+        timestamp = None
+        if last_modified is not None:
+            timestamp = timegm(last_modified.utctimetuple())
+            headers['Last-Modified'] = http_date(timestamp)
+
+        response = get_conditional_response(
+            request, headers['ETag'], timestamp, headers
+        )
+        if response is not headers:
+            return response
+
+        response = build()
+        if response.status_code == 200:
+            response['ETag'] = headers['ETag']
+            if timestamp is not None:
+                response['Last-Modified'] = headers['Last-Modified']
+        return response
+
+    def list(self, request, *args, **kwargs):
+        def build():
+            return super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            )
+
+        def build_from_primary():
+            with primary_reads():
+                return build()
+
+        if not self.cache_namespaces:
+            return build()
+        if not self.use_generation_etag():
+            return self.content_conditional_response(request, build)
+        version, last_modified = self.get_list_validators()
+        return self.conditional_response(
+            request, version, last_modified, build_from_primary
+        )
+
+    def content_conditional_response(self, request, build):
+        '''ETag из содержимого ответа: страница строится всегда'''
+        response = build()
+        if response.status_code != 200:
+            return response
+        response['ETag'] = make_etag(
+            response.data, request.accepted_renderer.format
+        )
+        return get_conditional_response(
+            request, response['ETag'], None, response
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        version, last_modified = self.get_object_validators(instance)
+        return self.conditional_response(
+            request, version, last_modified,
+            lambda: Response(self.get_serializer(instance).data)
+        )
@@ -1,3 +1,6 @@
+# Начальные списки модерации. Рабочие списки хранятся в базе
+# (AllowedEmailDomain, BannedTitleWord) и правятся в админке
+
 # Разрешённые домены для почты
 ALLOWED_EMAIL_DOMAINS = [
   'mail.ru',
@@ -10,3 +13,10 @@ BANNED_TITLE_WORDS = [
   'глупость',
   'чепуха',
 ]
+
+# Сколько последних комментариев показывать в списке постов
+LATEST_COMMENTS_LIMIT = 3
+
+# Конфигурация полнотекстового поиска PostgreSQL (стемминг для русского).
+# Та же, что в триггерах миграции 0006_search_vector
+SEARCH_CONFIG = 'russian'
@@ -0,0 +1,181 @@
+'''
+Денормализованные счётчики: Post.comment_count, User.post_count и
+User.comment_count. Меняются только F-выражениями (UPDATE ... SET
+n = n + k), поэтому параллельные запросы не теряют инкременты.
+
+Обычные save() и delete() обрабатывают сигналы (posts.signals), пакетные
+создание и изменение — BulkWriteMixin. Расхождения после загрузки данных
+в обход ORM исправляет команда reconcile_counters.
+'''
+import threading
+from collections import Counter, defaultdict
+from weakref import WeakValueDictionary
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .cache import invalidate
+from .models import Comment, Post, User
+
+
+# (модель, внешний ключ, модель со счётчиком, поле счётчика)
+COUNTERS = (
+    (Comment, 'post_id', Post, 'comment_count'),
+    (Comment, 'author_id', User, 'comment_count'),
+    (Post, 'author_id', User, 'post_count'),
+)
+
+# (модель, внешний ключ) -> модель со счётчиком
+TARGETS = {(source, fk): target for source, fk, target, _ in COUNTERS}
+
+
+def tracked_keys(instance):
+    '''Внешние ключи записи, от которых зависят счётчики'''
+    return {
+        fk: instance.__dict__.get(fk)
+        for source, fk, *_ in COUNTERS if isinstance(instance, source)
+    }
+
+
+def change(model, keys, delta):
+    '''
+    Прибавляет delta к счётчикам объектов, на которые ссылаются keys —
+    значения внешних ключей ({'post_id': 1, ...}) записей model.
+    Одним запросом на каждое поле и итоговое приращение. UPDATE не
+    трогает updated_at пользователя, поэтому ETag списков пользователей
+    сбрасывается здесь
+    '''
+    for source, fk, target, field in COUNTERS:
+        if source is not model:
+            continue
+        totals = Counter()
+        for values in keys:
+            if values.get(fk) is not None:
+                totals[values[fk]] += delta
+        by_amount = defaultdict(list)
+        for pk, amount in totals.items():
+            if amount:
+                by_amount[amount].append(pk)
+        for amount, pks in by_amount.items():
+            target.objects.filter(pk__in=pks).update(
+                **{field: F(field) + amount}
+            )
+        if by_amount and target is User:
+            invalidate('users')
+
+
+def created(model, instances):
+    change(model, [tracked_keys(instance) for instance in instances], 1)
+
+
+def moved(model, previous, current):
+    '''Запись сменила пост или автора: счётчик переходит к новому'''
+    moved_many(model, [(previous, current)])
+
+
+def moved_many(model, changes):
+    '''moved() для пар (было, стало) многих записей, общими запросами'''
+    removed = []
+    added = []
+    for previous, current in changes:
+        changed = [
+            fk for fk, value in current.items()
+            if value is not None and previous.get(fk) not in (None, value)
+        ]
+        if changed:
+            removed.append({fk: previous[fk] for fk in changed})
+            added.append({fk: current[fk] for fk in changed})
+    if removed:
+        change(model, removed, -1)
+        change(model, added, 1)
+
+
+class CascadeDeletions(threading.local):
+    '''
+    Посты и пользователи, удаляемые сейчас каскадом (отмечаются в
+    pre_delete). Счётчики, которые уменьшили бы удалённые с ними записи,
+    собираются на самом удаляемом объекте и применяются одним change()
+    в его post_delete, без UPDATE строк, которые тоже удаляются.
+
+    Ссылки слабые: отметки удаления, упавшего до post_delete, исчезают
+    вместе с его объектами
+    '''
+
+    def __init__(self):
+        self.doomed = {
+            target: WeakValueDictionary() for target in (Post, User)
+        }
+
+    def start(self, model, instance):
+        instance._cascade_keys = defaultdict(list)
+        self.doomed[model][instance.pk] = instance
+
+    def owner(self, model, keys):
+        '''Удаляемый объект, на который ссылается запись, или None'''
+        for source, fk, target, _ in COUNTERS:
+            if source is model and keys.get(fk) is not None:
+                owner = self.doomed[target].get(keys[fk])
+                if owner is not None:
+                    return owner
+        return None
+
+    def finish(self, instance):
+        '''Счётчики записей, удалённых вместе с instance'''
+        for model, keys in instance._cascade_keys.items():
+            change(model, [
+                {
+                    fk: value for fk, value in values.items()
+                    if value not in self.doomed[TARGETS[model, fk]]
+                }
+                for values in keys
+            ], -1)
+        self.doomed[type(instance)].pop(instance.pk, None)
+        del instance._cascade_keys
+
+
+cascade = CascadeDeletions()
+
+
+def deleted(model, instance):
+    '''
+    Запись удалена: её счётчики уменьшаются сразу или, при каскадном
+    удалении поста или пользователя, вместе с остальными записями каскада
+    '''
+    keys = tracked_keys(instance)
+    owner = cascade.owner(model, keys)
+    if owner is not None:
+        owner._cascade_keys[model].append(keys)
+    elif keys:
+        change(model, [keys], -1)
+    if hasattr(instance, '_cascade_keys'):
+        cascade.finish(instance)
+
+
+def actual_count(source, fk):
+    '''Подзапрос: сколько записей source ссылаются на внешнюю строку'''
+    return Coalesce(Subquery(
+        source.objects.filter(**{fk: OuterRef('pk')})
+        .order_by()
+        .values(fk)
+        .annotate(count=Count('pk'))
+        .values('count')
+    ), 0)
+
+
+def reconcile(dry_run=False):
+    '''
+    Пересчитывает счётчики по таблицам и исправляет разошедшиеся строки.
+    Возвращает {'модель.поле': число исправленных (найденных) строк}
+    '''
+    result = {}
+    for source, fk, target, field in COUNTERS:
+        actual = actual_count(source, fk)
+        drifted = target.objects.exclude(**{field: actual})
+        name = f'{target._meta.model_name}.{field}'
+        if dry_run:
+            result[name] = drifted.count()
+        else:
+            result[name] = drifted.update(**{field: actual})
+            if result[name] and target is User:
+                invalidate('users')
+    return result
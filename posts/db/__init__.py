@@ -0,0 +1,4 @@
+'''
+Бэкенд PostgreSQL проекта (ENGINE = 'posts.db'): стандартный бэкенд
+Django с проверкой переиспользуемых соединений CONN_HEALTH_CHECKS.
+'''
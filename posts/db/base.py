@@ -0,0 +1,34 @@
+'''
+CONN_HEALTH_CHECKS, как в Django 4.1: переиспользуемое соединение
+проверяется (SELECT 1) один раз за запрос и только при первом обращении
+к БД. Ответы из кеша и 304 соединение не трогают, а реплика проверяется,
+только если запрос читал из неё. Сломанное соединение (перезапуск БД
+или pgbouncer) закрывается, и запрос открывает новое, а не падает.
+'''
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Соединение уже проверено (или открыто) в текущем запросе
+    health_check_done = False
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        # Вызывается сигналами request_started и request_finished
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        if (self.connection is None or self.health_check_done
+                or not self.settings_dict.get('CONN_HEALTH_CHECKS')):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
@@ -0,0 +1,197 @@
+'''
+Быстрый путь чтения списков: строки values() сериализуются по плану,
+собранному один раз на запрос из полей сериализатора, — без экземпляров
+моделей и обхода полей ModelSerializer для каждой строки. Ответ
+совпадает с обычным побайтно.
+
+Простые поля (числа, строки, даты, файлы, первичные ключи связей) план
+читает сам. Остальные сериализатор описывает методом read_<поле>,
+возвращающим ReadField. Если поле описать нельзя или сериализатор
+переопределяет to_representation, запрос идёт обычным путём.
+'''
+from operator import itemgetter
+
+from django.conf import settings
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+# Поля, у которых to_representation не меняет значение из БД
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
+
+
+class UnsupportedField(Exception):
+    '''Поле нельзя построить из строки values()'''
+
+
+class ReadField:
+    '''
+    Как получить значение поля из строки: нужные столбцы, функция от
+    строки и необязательная подготовка по всем строкам страницы
+    (например, один запрос за вложенными объектами)
+    '''
+
+    def __init__(self, columns, get, prepare=None):
+        self.columns = tuple(columns)
+        self.get = get
+        self.prepare = prepare
+
+
+def column(name, convert=None):
+    '''Значение столбца; None, как и в DRF, выводится без преобразования'''
+    if convert is None:
+        return ReadField((name,), itemgetter(name))
+
+    def get(row):
+        value = row[name]
+        return None if value is None else convert(value)
+    return ReadField((name,), get)
+
+
+def file_url(field, storage):
+    '''FileField.to_representation по имени файла вместо FieldFile'''
+    use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+    request = field.context.get('request')
+
+    def convert(name):
+        if not name:
+            return None
+        if not use_url:
+            return name
+        url = storage.url(name)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    return convert
+
+
+def iso_datetime(field):
+    '''
+    DateTimeField.to_representation с часовым поясом, найденным один раз
+    на план: DRF ищет текущий пояс для каждого значения, и в длинных
+    списках это основная часть времени сериализации
+    '''
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if hasattr(field, 'timezone'):
+        field_timezone = field.timezone
+    else:
+        field_timezone = field.default_timezone()
+    if (output_format is None or output_format.lower() != ISO_8601
+            or field_timezone is None):
+        return field.to_representation
+
+    def convert(value):
+        if value.utcoffset() is None:
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(field_timezone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+class ReadPlan:
+    '''План сериализации строк values() для полей сериализатора'''
+
+    def __init__(self, serializer):
+        # Переопределённый to_representation план бы молча пропустил
+        if (type(serializer).to_representation
+                is not serializers.ModelSerializer.to_representation):
+            raise UnsupportedField('to_representation')
+        model = serializer.Meta.model
+        fields = [
+            (name, self.compile(serializer, model, name, field))
+            for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+        self.columns = tuple(dict.fromkeys(
+            column for _, field in fields for column in field.columns
+        ))
+        self.steps = tuple((name, field.get) for name, field in fields)
+        self.preparers = [
+            field.prepare for _, field in fields if field.prepare is not None
+        ]
+
+    @staticmethod
+    def compile(serializer, model, name, field):
+        hook = getattr(serializer, f'read_{name}', None)
+        if hook is not None:
+            return hook()
+        if field.source == '*':
+            raise UnsupportedField(name)
+        try:
+            model_field = model._meta.get_field(field.source)
+        except Exception:
+            raise UnsupportedField(name)
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None:
+                raise UnsupportedField(name)
+            return column(model_field.attname)
+        if isinstance(field, serializers.FileField):
+            return column(
+                model_field.attname, file_url(field, model_field.storage)
+            )
+        if isinstance(field, serializers.DateTimeField):
+            return column(model_field.attname, iso_datetime(field))
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            return column(model_field.attname)
+        raise UnsupportedField(name)
+
+    def serialize(self, rows):
+        for prepare in self.preparers:
+            prepare(rows)
+        steps = self.steps
+        return [{name: get(row) for name, get in steps} for row in rows]
+
+
+class FastReadMixin:
+    '''
+    Списки через ReadPlan. Выключается настройкой POSTS_FAST_READ;
+    детальные ответы остаются на сериализаторе: им нужен экземпляр для
+    прав и ETag, а одна строка не стоит заметного CPU
+    '''
+
+    def get_read_plan(self):
+        if not settings.POSTS_FAST_READ:
+            return None
+        try:
+            return ReadPlan(self.get_serializer())
+        except UnsupportedField:
+            return None
+
+    def list_response(self, queryset):
+        '''Ответ со списком (страницей) из отфильтрованного queryset'''
+        plan = self.get_read_plan()
+        if plan is None:
+            page = self.paginate_queryset(queryset)
+            if page is None:
+                return Response(self.get_serializer(queryset, many=True).data)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        columns = dict.fromkeys(plan.columns)
+        if self.paginator is not None:
+            # Курсору нужны значения полей сортировки каждой строки
+            ordering = self.paginator.get_ordering(
+                self.request, queryset, self
+            )
+            columns.update(
+                dict.fromkeys(name.lstrip('-') for name in ordering)
+            )
+        rows = queryset.prefetch_related(None).values(*columns)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(plan.serialize(list(rows)))
+        return self.get_paginated_response(plan.serialize(page))
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (Argon2PasswordHasher,
+                                         BCryptSHA256PasswordHasher)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    '''
+    Argon2id с параметрами из настроек. По умолчанию — рекомендация OWASP
+    (19 МиБ, 2 прохода, 1 поток) вместо 100 МиБ и 8 потоков Django:
+    вход дешевле по CPU и памяти воркера. Хеши со старыми параметрами
+    пересчитываются при следующем входе.
+    '''
+    time_cost = settings.POSTS_ARGON2_TIME_COST
+    memory_cost = settings.POSTS_ARGON2_MEMORY_COST
+    parallelism = settings.POSTS_ARGON2_PARALLELISM
+
+
+class TunedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    '''bcrypt с числом раундов из настроек'''
+    rounds = settings.POSTS_BCRYPT_ROUNDS
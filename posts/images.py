@@ -0,0 +1,176 @@
+'''
+Фоновая обработка изображений постов: уменьшенные копии (варианты)
+строятся вне запроса, а API отдаёт ссылки на них вместо оригинала.
+
+Очередь выбирается настройкой POSTS_IMAGE_QUEUE:
+
+- db — задачи ImageTask в БД, их выполняет команда process_images;
+- thread — пул потоков текущего процесса, без отдельного воркера;
+- immediate — сразу в вызывающем потоке (тесты, отладка).
+'''
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import invalidate
+from .models import ImageTask, Post
+from .uploads import check_pixels
+
+
+VARIANTS_DIR = 'post_images/variants'
+
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix='posts-images'
+)
+
+
+def render_variant(image, size):
+    variant = image.copy()
+    variant.thumbnail(size, Image.LANCZOS)
+    image_format = settings.POSTS_IMAGE_FORMAT
+    if image_format == 'JPEG' and variant.mode != 'RGB':
+        variant = variant.convert('RGB')
+    elif variant.mode not in ('RGB', 'RGBA'):
+        variant = variant.convert('RGBA')
+    buffer = BytesIO()
+    variant.save(
+        buffer, image_format,
+        quality=settings.POSTS_IMAGE_QUALITY, optimize=True
+    )
+    return buffer.getvalue()
+
+
+def build_variants(post):
+    '''Строит и сохраняет все варианты, возвращает {вариант: имя файла}'''
+    storage = post.image.storage
+    with post.image.open('rb') as source:
+        image = Image.open(source)
+        # Размер из заголовка проверяется до декодирования
+        check_pixels(*image.size)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    extension = EXTENSIONS[settings.POSTS_IMAGE_FORMAT]
+    files = {}
+    for name, size in settings.POSTS_IMAGE_VARIANTS.items():
+        content = render_variant(image, size)
+        # Имя по хешу самого варианта: другие размер, формат или качество
+        # дадут другое имя, и кеш браузера не отдаст старые байты
+        digest = hashlib.sha256(content).hexdigest()
+        files[name] = storage.save(
+            f'{VARIANTS_DIR}/{digest}_{name}.{extension}',
+            ContentFile(content)
+        )
+    return files
+
+
+def delete_variants(post):
+    storage = post.image.storage
+    for name in post.image_variants.get('files', {}).values():
+        storage.delete(name)
+
+
+def process_post_image(post_id):
+    '''
+    Строит варианты для текущего изображения поста. Если пока шла
+    обработка изображение заменили, результат отбрасывается: новое
+    изображение поставлено в очередь отдельно.
+    '''
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None or not post.image:
+        return
+    source = post.image.name
+    if post.image_variants.get('source') == source:
+        return
+
+    files = build_variants(post)
+    updated = Post.objects.filter(pk=post_id, image=source).update(
+        image_variants={'source': source, 'files': files},
+        updated_at=timezone.now()
+    )
+    if not updated:
+        storage = post.image.storage
+        for name in files.values():
+            storage.delete(name)
+        return
+    delete_variants(post)
+    invalidate('posts')
+
+
+def _process_in_thread(post_id):
+    # Соединение с БД у потока пула своё: закрываем его после задачи
+    try:
+        process_post_image(post_id)
+    finally:
+        connections.close_all()
+
+
+def enqueue_post_image(post_id):
+    queue = settings.POSTS_IMAGE_QUEUE
+    if queue == 'immediate':
+        process_post_image(post_id)
+    elif queue == 'thread':
+        # Поток должен увидеть пост, поэтому только после коммита
+        transaction.on_commit(
+            lambda: executor.submit(_process_in_thread, post_id)
+        )
+    else:
+        # Задача создаётся в той же транзакции, что и пост
+        ImageTask.objects.get_or_create(
+            post_id=post_id, status=ImageTask.PENDING
+        )
+
+
+def retry_delay(attempts):
+    '''Пауза перед следующей попыткой: растёт вдвое после каждой ошибки'''
+    return timedelta(
+        seconds=settings.POSTS_IMAGE_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def run_pending_tasks(limit=None):
+    '''
+    Выполняет задачи из очереди в БД, возвращает число обработанных.
+    Задача блокируется на время обработки (SKIP LOCKED), поэтому
+    воркеров может быть несколько; при падении воркера транзакция
+    откатывается и задача остаётся в очереди. Задача с ошибкой
+    повторяется не раньше run_after, с экспоненциальной паузой.
+    '''
+    processed = 0
+    while limit is None or processed < limit:
+        with transaction.atomic():
+            task = (
+                ImageTask.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=ImageTask.PENDING, run_after__lte=timezone.now()
+                )
+                .order_by('run_after')
+                .first()
+            )
+            if task is None:
+                break
+            try:
+                with transaction.atomic():
+                    process_post_image(task.post_id)
+            except Exception as exc:
+                task.attempts += 1
+                task.error = str(exc)
+                if task.attempts >= settings.POSTS_IMAGE_MAX_ATTEMPTS:
+                    task.status = ImageTask.FAILED
+                task.run_after = timezone.now() + retry_delay(task.attempts)
+                task.save(
+                    update_fields=['attempts', 'error', 'status', 'run_after']
+                )
+            else:
+                task.delete()
+        processed += 1
+    return processed
@@ -1,98 +1,258 @@
-from django.core.management.base import BaseCommand
+import csv
+import json
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from io import StringIO
+
 from django.contrib.auth import get_user_model
-from posts.models import Post, Comment
-from datetime import datetime, timedelta, time
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
 from django.utils import timezone
-import random
+
+from posts.cache import POST_COMMENTS, invalidate
+from posts.counters import reconcile
+from posts.models import Post, Comment
+
+
+User = get_user_model()
+
+PASSWORD = 'admin'
+
+# Именованные пользователи для ручной проверки API
+NAMED_USERS = (
+    {
+        'username': 'admin', 'phone': '1111111111',
+        'birth_date': date(1990, 1, 1), 'is_staff': True,
+        'is_superuser': True,
+    },
+    {
+        'username': 'underage', 'phone': '2222222222',
+        'birth_date': date(2010, 1, 1),
+    },
+    {
+        'username': 'adult', 'phone': '3333333333',
+        'birth_date': date(1995, 1, 1),
+    },
+    {
+        'username': 'TEST', 'phone': '4444444444',
+        'birth_date': date(2000, 1, 1),
+    },
+)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    '''
+    Отключает auto_now/auto_now_add, чтобы bulk_create сохранил
+    сгенерированные даты, а не текущее время
+    '''
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
 
 
 class Command(BaseCommand):
-    help = 'Создаёт тестовых пользователей, 15 постов и комментарии'
-
-    def handle(self, *args, **kwargs):
-        User = get_user_model()
-
-        User.objects.all().delete()
-        Post.objects.all().delete()
-        Comment.objects.all().delete()
-
-        admin = User.objects.create_user(
-            username='admin',
-            email='admin@mail.ru',
-            phone='1111111111',
-            birth_date=datetime(1990, 1, 1).date(),
-            is_staff=True,
-            is_superuser=True,
-            is_active=True,
+    help = (
+        'Создаёт тестовых пользователей, посты и комментарии. По умолчанию '
+        '4 пользователя, 15 постов и 30 комментариев; объём задаётся '
+        'параметрами'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=0,
+            help='Сколько сгенерировать пользователей сверх именованных'
         )
-        admin.set_password('admin')
-        admin.save()
-
-        underage = User.objects.create_user(
-            username='underage',
-            email='underage@mail.ru',
-            phone='2222222222',
-            birth_date=datetime(2010, 1, 1).date(),
-            is_active=True,
+        parser.add_argument('--posts', type=int, default=15)
+        parser.add_argument('--comments-per-post', type=int, default=2)
+        parser.add_argument(
+            '--days', type=int, default=14,
+            help='За сколько последних дней распределить посты'
         )
-        underage.set_password('admin')
-        underage.save()
-
-        adult = User.objects.create_user(
-            username='adult',
-            email='adult@mail.ru',
-            phone='3333333333',
-            birth_date=datetime(1995, 1, 1).date(),
-            is_active=True,
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора: одинаковые параметры — одинаковые данные'
         )
-        adult.set_password('admin')
-        adult.save()
-
-        TEST = User.objects.create_user(
-            username='TEST',
-            email='TEST@mail.ru',
-            phone='4444444444',
-            birth_date=datetime(2000, 1, 1).date(),
-            is_active=True,
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument(
+            '--copy', action='store_true',
+            help='Загружать посты и комментарии через COPY (быстрее)'
         )
-        TEST.set_password('admin')
-        TEST.save()
-
-        base_date = timezone.now().date() - timedelta(days=14)
-        posts = []
-        for i in range(15):
-            post = Post.objects.create(
-                title=f'Пост №{i + 1}',
-                text=f'Содержимое поста №{i + 1}',
-                author=adult,
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='Не очищать таблицы перед загрузкой'
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.use_copy = options['copy']
+        self.now = timezone.now()
+        started = time.monotonic()
+
+        with transaction.atomic(), explicit_timestamps(User, Post, Comment):
+            if not options['keep']:
+                self.truncate()
+            # Хеш считается один раз и одинаков у всех пользователей
+            self.password = make_password(PASSWORD)
+            self.create_users(options['users'])
+            # Авторы — взрослые пользователи без прав администратора
+            today = self.now.date()
+            authors = list(
+                User.objects.filter(
+                    is_staff=False,
+                    birth_date__lte=today.replace(year=today.year - 18)
+                ).values_list('id', flat=True)
             )
-            hour = random.randint(0, 23)
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-            dt = datetime.combine(
-                base_date + timedelta(days=i),
-                time(hour=hour, minute=minute, second=second),
+            # С --keep комментарии получают только новые посты
+            last_post_id = (
+                Post.objects.aggregate(last=Max('id'))['last'] or 0
             )
-            post.created_at = timezone.make_aware(dt)
-            post.save(update_fields=['created_at'])
-            posts.append(post)
-
-        for post in posts:
-            for j in range(2):
-                hour = random.randint(0, 23)
-                minute = random.randint(0, 59)
-                second = random.randint(0, 59)
-                dt = datetime.combine(
-                    post.created_at.date(),
-                    time(hour=hour, minute=minute, second=second),
-                )
-                Comment.objects.create(
-                    author=adult,
-                    post=post,
-                    text=f'Комментарий {j + 1} к посту "{post.title}"',
-                    created_at=timezone.make_aware(dt),
+            posts = self.insert(
+                Post,
+                ('title', 'text', 'image_variants', 'author_id',
+                 'created_at', 'updated_at'),
+                self.generate_posts(options['posts'], options['days'],
+                                    authors)
+            )
+            comments = self.insert(
+                Comment,
+                ('author_id', 'post_id', 'text', 'created_at', 'updated_at'),
+                self.generate_comments(
+                    options['comments_per_post'], authors, last_post_id
                 )
+            )
+            # Пакетная вставка идёт в обход сигналов: счётчики считаются
+            # одним проходом в конце
+            reconcile()
+        invalidate('posts', 'comments', POST_COMMENTS)
 
         self.stdout.write(self.style.SUCCESS(
-            'Созданы пользователи, 15 постов с датами и 30 комментариев'
+            f'Созданы {len(NAMED_USERS) + options["users"]} пользователей, '
+            f'{posts} постов и {comments} комментариев '
+            f'за {time.monotonic() - started:.1f} с'
         ))
+
+    def truncate(self):
+        tables = ', '.join(
+            connection.ops.quote_name(model._meta.db_table)
+            for model in (Comment, Post, User)
+        )
+        with connection.cursor() as cursor:
+            # Отложенные проверки внешних ключей выполняются сразу:
+            # с ними в очереди PostgreSQL не даст очистить таблицы
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            # CASCADE очищает и таблицы, ссылающиеся на пользователей
+            cursor.execute(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
+
+    def create_users(self, count):
+        users = [
+            User(
+                email=f'{data["username"]}@mail.ru', password=self.password,
+                is_active=True, date_joined=self.now, created_at=self.now,
+                updated_at=self.now, **data
+            )
+            for data in NAMED_USERS
+        ]
+        for i in range(1, count + 1):
+            users.append(User(
+                username=f'user_{i:07d}', email=f'user_{i}@mail.ru',
+                phone=f'{7000000000 + i}', password=self.password,
+                birth_date=date(1960, 1, 1) + timedelta(
+                    days=self.rng.randint(0, 40 * 365)
+                ),
+                is_active=True, date_joined=self.now, created_at=self.now,
+                updated_at=self.now
+            ))
+        # С --keep уже существующие пользователи пропускаются
+        User.objects.bulk_create(
+            users, batch_size=self.batch_size, ignore_conflicts=True
+        )
+
+    def generate_posts(self, count, days, authors):
+        start = self.now - timedelta(days=days)
+        for i in range(1, count + 1):
+            created_at = start + timedelta(
+                seconds=self.rng.randint(0, days * 86400)
+            )
+            yield (
+                f'Пост №{i}', f'Содержимое поста №{i}', {},
+                self.rng.choice(authors), created_at, created_at
+            )
+
+    def generate_comments(self, per_post, authors, after_id=0):
+        posts = (
+            Post.objects.filter(id__gt=after_id).order_by('id')
+            .values_list('id', 'title', 'created_at')
+            .iterator(chunk_size=self.batch_size)
+        )
+        for post_id, title, post_created_at in posts:
+            for j in range(1, per_post + 1):
+                created_at = min(
+                    post_created_at + timedelta(
+                        seconds=self.rng.randint(0, 86400)
+                    ),
+                    self.now
+                )
+                yield (
+                    self.rng.choice(authors), post_id,
+                    f'Комментарий {j} к посту "{title}"',
+                    created_at, created_at
+                )
+
+    def insert(self, model, fields, rows):
+        '''Вставляет строки пачками по batch_size, возвращает их число'''
+        total = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self.insert_batch(model, fields, batch)
+                batch = []
+        if batch:
+            total += self.insert_batch(model, fields, batch)
+        return total
+
+    def insert_batch(self, model, fields, batch):
+        if not self.use_copy:
+            model.objects.bulk_create(
+                model(**dict(zip(fields, row))) for row in batch
+            )
+            return len(batch)
+
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow(
+                json.dumps(value) if isinstance(value, dict)
+                else value.isoformat() if hasattr(value, 'isoformat')
+                else value
+                for value in row
+            )
+        buffer.seek(0)
+        columns = ', '.join(
+            connection.ops.quote_name(model._meta.get_field(name).column)
+            for name in fields
+        )
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)',
+                buffer
+            )
+        return len(batch)
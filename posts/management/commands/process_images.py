@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.images import run_pending_tasks
+
+
+class Command(BaseCommand):
+    help = 'Воркер очереди изображений: строит варианты загруженных картинок'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать накопившиеся задачи и завершиться'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Пауза между опросами пустой очереди, секунды'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_tasks()
+            if processed:
+                self.stdout.write(f'Обработано задач: {processed}')
+            elif options['once']:
+                break
+            else:
+                time.sleep(options['interval'])
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.cache import invalidate
+from posts.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счётчики постов и комментариев по таблицам и '
+        'исправляет расхождения'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, сколько строк разошлось'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            result = reconcile(dry_run=options['dry_run'])
+        if not options['dry_run'] and any(result.values()):
+            invalidate('posts')
+        for name, rows in result.items():
+            self.stdout.write(f'{name}: {rows}')
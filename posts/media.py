@@ -0,0 +1,72 @@
+'''
+Раздача медиафайлов: Django проверяет доступ, а байты отдаёт фронтовой
+прокси (nginx — X-Accel-Redirect, Apache/lighttpd — X-Sendfile). Без
+прокси — FileResponse, который gunicorn отправляет через sendfile().
+'''
+import mimetypes
+import os
+import re
+import stat as stat_module
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.http import HttpResponseNotModified
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+
+# Имена файлов, начинающиеся с sha256 своего содержимого (posts.uploads,
+# варианты из posts.images): под таким именем другое содержимое не появится
+CONTENT_HASHED = re.compile(r'^[0-9a-f]{64}')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def can_read(request, name):
+    '''Изображения постов публичны, как и сами посты'''
+    return name.startswith(settings.POSTS_MEDIA_PUBLIC_PREFIXES)
+
+
+def cache_control(name):
+    if CONTENT_HASHED.match(os.path.basename(name)):
+        return IMMUTABLE
+    return f'public, max-age={settings.POSTS_MEDIA_MAX_AGE}'
+
+
+@require_safe
+def serve_media(request, path):
+    name = os.path.normpath(path).lstrip('/')
+    if name.startswith('..') or not can_read(request, name):
+        raise Http404('Файл не найден')
+    try:
+        full_path = default_storage.path(name)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, FileNotFoundError, NotADirectoryError):
+        raise Http404('Файл не найден')
+    if not stat_module.S_ISREG(stat.st_mode):
+        raise Http404('Файл не найден')
+
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime,
+        stat.st_size
+    ):
+        response = HttpResponseNotModified()
+    elif settings.POSTS_MEDIA_ACCEL == 'nginx':
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = settings.POSTS_MEDIA_ACCEL_PREFIX + name
+    elif settings.POSTS_MEDIA_ACCEL == 'sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = full_path
+    else:
+        response = FileResponse(open(full_path, 'rb'))
+
+    if settings.POSTS_MEDIA_ACCEL and response.status_code == 200:
+        # Тело отдаёт прокси, тип содержимого задаём сами
+        content_type, encoding = mimetypes.guess_type(name)
+        response['Content-Type'] = content_type or 'application/octet-stream'
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = cache_control(name)
+    return response
@@ -0,0 +1,44 @@
+# Generated by Django 3.2 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+# Значения posts/constants.py на момент переноса списков в базу
+ALLOWED_EMAIL_DOMAINS = ['mail.ru', 'yandex.ru']
+BANNED_TITLE_WORDS = ['ерунда', 'глупость', 'чепуха']
+
+
+def seed_lists(apps, schema_editor):
+    AllowedEmailDomain = apps.get_model('posts', 'AllowedEmailDomain')
+    BannedTitleWord = apps.get_model('posts', 'BannedTitleWord')
+    AllowedEmailDomain.objects.bulk_create(
+        [AllowedEmailDomain(domain=domain) for domain in ALLOWED_EMAIL_DOMAINS]
+    )
+    BannedTitleWord.objects.bulk_create(
+        [BannedTitleWord(word=word) for word in BANNED_TITLE_WORDS]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AllowedEmailDomain',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BannedTitleWord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.RunPython(seed_lists, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 3.2 on 2026-10-18 09:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Конфигурация поиска со стеммингом под русский контент. Должна совпадать
+# с posts.constants.SEARCH_CONFIG, по которой строятся запросы
+POST_VECTOR = '''
+    setweight(to_tsvector('russian', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('russian', coalesce({row}text, '')), 'B')
+'''
+COMMENT_VECTOR = "to_tsvector('russian', coalesce({row}text, ''))"
+
+# Триггер пересчитывает вектор при любой записи заголовка или текста:
+# save(), bulk_create, update() и COPY (create_test_data --copy)
+TRIGGER_SQL = '''
+CREATE FUNCTION {table}_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {vector};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER {table}_search_vector
+BEFORE INSERT OR UPDATE OF {columns} ON {table}
+FOR EACH ROW EXECUTE FUNCTION {table}_search_vector();
+
+UPDATE {table} SET search_vector = {backfill};
+'''
+
+DROP_TRIGGER_SQL = '''
+DROP TRIGGER {table}_search_vector ON {table};
+DROP FUNCTION {table}_search_vector();
+'''
+
+
+def trigger(table, vector, columns):
+    return migrations.RunSQL(
+        TRIGGER_SQL.format(
+            table=table, columns=columns,
+            vector=vector.format(row='NEW.'), backfill=vector.format(row='')
+        ),
+        DROP_TRIGGER_SQL.format(table=table),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # Векторы заполняются до построения индексов: так быстрее
+        trigger('posts_post', POST_VECTOR, 'title, text'),
+        trigger('posts_comment', COMMENT_VECTOR, 'text'),
+        migrations.AddIndex(
+            model_name='comment',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='comment_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='post_search_idx'),
+        ),
+    ]
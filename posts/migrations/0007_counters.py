@@ -0,0 +1,61 @@
+# Generated by Django 3.2 on 2026-10-18 09:58
+
+from django.db import migrations, models
+
+
+# Значение по умолчанию и в самой БД: строки, вставленные в обход ORM
+# (COPY, SQL бенчмарков), получают 0, а не нарушение NOT NULL
+DEFAULTS_SQL = '''
+ALTER TABLE posts_post ALTER COLUMN comment_count SET DEFAULT 0;
+ALTER TABLE posts_user ALTER COLUMN post_count SET DEFAULT 0;
+ALTER TABLE posts_user ALTER COLUMN comment_count SET DEFAULT 0;
+'''
+
+# Начальные значения для уже существующих данных
+BACKFILL_SQL = '''
+UPDATE posts_post AS p SET comment_count = c.count
+FROM (
+    SELECT post_id, count(*) AS count FROM posts_comment GROUP BY post_id
+) AS c
+WHERE c.post_id = p.id;
+
+UPDATE posts_user AS u SET post_count = p.count
+FROM (
+    SELECT author_id, count(*) AS count FROM posts_post GROUP BY author_id
+) AS p
+WHERE p.author_id = u.id;
+
+UPDATE posts_user AS u SET comment_count = c.count
+FROM (
+    SELECT author_id, count(*) AS count FROM posts_comment
+    GROUP BY author_id
+) AS c
+WHERE c.author_id = u.id;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='post_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(DEFAULTS_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 10:34
+
+from django.db import migrations, models
+
+
+def create_version(apps, schema_editor):
+    ModerationVersion = apps.get_model('posts', 'ModerationVersion')
+    ModerationVersion.objects.create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+    ]
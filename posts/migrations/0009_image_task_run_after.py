@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-18 10:36
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_moderation_version'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='imagetask',
+            name='image_task_queue_idx',
+        ),
+        migrations.AddField(
+            model_name='imagetask',
+            name='run_after',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='imagetask',
+            index=models.Index(fields=['status', 'run_after'], name='image_task_queue_idx'),
+        ),
+    ]
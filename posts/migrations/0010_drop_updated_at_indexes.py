@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 11:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_image_task_run_after'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_updated_idx',
+        ),
+    ]
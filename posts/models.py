@@ -1,31 +1,78 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 
 
-class User(AbstractUser):
+class CounterFieldsMixin:
+    '''
+    Счётчики меняются только F-выражениями (posts.counters). save()
+    существующей строки их не записывает: иначе значение, прочитанное до
+    чужого инкремента, затёрло бы его
+    '''
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None \
+                and not kwargs.get('force_insert'):
+            skip = {*self.counter_fields, *self.get_deferred_fields()}
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skip
+            ]
+        super().save(*args, **kwargs)
+
+
+class User(CounterFieldsMixin, AbstractUser):
     '''Кастомная модель пользователя. Логин и пароль уже включены'''
     phone = models.CharField(max_length=20)
     birth_date = models.DateField()
+    post_count = models.IntegerField(default=0, editable=False)
+    comment_count = models.IntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    counter_fields = ('post_count', 'comment_count')
+
     def __str__(self):
         return self.username
 
 
-class Post(models.Model):
+class Post(CounterFieldsMixin, models.Model):
     '''Модель поста. Связь с комментариями через related_name="comments"'''
     title = models.CharField(max_length=255)
     text = models.TextField()
     image = models.ImageField(upload_to='post_images/', blank=True, null=True)
+    # Уменьшенные копии изображения от фоновой обработки (posts.images):
+    # {'source': имя исходного файла, 'files': {вариант: имя файла}}
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Заголовок (вес A) и текст (вес B) для полнотекстового поиска.
+    # Заполняется триггером БД из миграции 0006_search_vector
+    search_vector = SearchVectorField(null=True, editable=False)
     author = models.ForeignKey(
         'User',
         on_delete=models.CASCADE,
         related_name='posts'
     )
+    comment_count = models.IntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    counter_fields = ('comment_count',)
+
+    class Meta:
+        indexes = [
+            # Лента постов и фильтр по дате в админке
+            models.Index(
+                fields=['created_at', 'id'], name='post_created_id_idx'
+            ),
+            models.Index(
+                fields=['author', 'created_at'], name='post_author_created_idx'
+            ),
+            GinIndex(fields=['search_vector'], name='post_search_idx'),
+        ]
+
     def __str__(self):
         return f'Пост "{self.title}" от {self.author}'
 
@@ -43,8 +90,106 @@ class Comment(models.Model):
         related_name='comments'
     )
     text = models.TextField()
+    # Заполняется триггером БД из миграции 0006_search_vector
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Ветка комментариев одного поста в порядке пагинации
+            models.Index(
+                fields=['post', 'created_at', 'id'],
+                name='comment_post_created_idx'
+            ),
+            models.Index(
+                fields=['author', 'created_at'],
+                name='comment_author_created_idx'
+            ),
+            models.Index(
+                fields=['created_at', 'id'], name='comment_created_id_idx'
+            ),
+            GinIndex(fields=['search_vector'], name='comment_search_idx'),
+        ]
+
     def __str__(self):
         return f'Комментарий {self.author} к посту "{self.post}"'
+
+
+class AllowedEmailDomain(models.Model):
+    '''Домен почты, разрешённый при регистрации'''
+    domain = models.CharField(max_length=255, unique=True)
+
+    def clean(self):
+        # До validate_unique: иначе «Mail.ru» пройдёт проверку формы и
+        # упрётся в уникальный индекс уже при сохранении
+        self.domain = self.domain.strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.domain = self.domain.strip().lower()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.domain
+
+
+class BannedTitleWord(models.Model):
+    '''Слово, запрещённое в заголовке поста'''
+    word = models.CharField(max_length=100, unique=True)
+
+    def clean(self):
+        # Как у AllowedEmailDomain: уникальность проверяется без регистра
+        self.word = self.word.strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.word = self.word.strip().lower()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.word
+
+
+class ModerationVersion(models.Model):
+    '''
+    Единственная строка с версией списков модерации. Процессы сверяют её,
+    чтобы перечитать списки после изменения в любом другом процессе
+    '''
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f'Версия списков модерации {self.version}'
+
+
+class ImageTask(models.Model):
+    '''Задача очереди в БД: построить варианты изображения поста'''
+    PENDING = 'pending'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'В очереди'),
+        (FAILED, 'Ошибка'),
+    ]
+
+    post = models.ForeignKey(
+        'Post',
+        on_delete=models.CASCADE,
+        related_name='image_tasks'
+    )
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Не раньше этого времени: повтор после ошибки откладывается
+    run_after = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Выборка следующей задачи воркером
+            models.Index(
+                fields=['status', 'run_after'], name='image_task_queue_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'Изображение поста {self.post_id}: {self.status}'
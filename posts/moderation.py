@@ -0,0 +1,192 @@
+import logging
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+
+from .models import AllowedEmailDomain, BannedTitleWord, ModerationVersion
+
+
+VERSION_PK = 1
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix='posts-moderation'
+)
+
+
+def _trie_pattern(node):
+    '''Регулярное выражение для поддерева префиксного дерева слов'''
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ''
+    is_word_end = '' in node
+    if len(branches) == 1 and not is_word_end:
+        return branches[0]
+    pattern = '(?:' + '|'.join(branches) + ')'
+    return pattern + '?' if is_word_end else pattern
+
+
+class WordMatcher:
+    '''
+    Поиск любого слова из списка целиком за один проход по тексту.
+    Шаблон строится по префиксному дереву слов, поэтому стоимость
+    поиска не растёт линейно с длиной списка.
+    '''
+
+    def __init__(self, words):
+        self.words = frozenset(word.lower() for word in words if word)
+        trie = {}
+        for word in self.words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        self.pattern = (
+            re.compile(rf'\b{_trie_pattern(trie)}\b') if trie else None
+        )
+
+    def search(self, text):
+        '''Первое найденное слово или None'''
+        if self.pattern is None:
+            return None
+        match = self.pattern.search(text.lower())
+        return match.group() if match else None
+
+
+# Неизменяемая копия списков одной версии
+Snapshot = namedtuple(
+    'Snapshot', ['version', 'email_domains', 'title_matcher']
+)
+
+
+def load_snapshot():
+    version = get_version()
+    return Snapshot(
+        version,
+        frozenset(
+            AllowedEmailDomain.objects.values_list('domain', flat=True)
+        ),
+        WordMatcher(BannedTitleWord.objects.values_list('word', flat=True)),
+    )
+
+
+class ModerationLists:
+    '''
+    Копии списков модерации в памяти процесса: frozenset доменов и
+    скомпилированный WordMatcher. Версия списков хранится строкой
+    ModerationVersion в базе, общей для всех процессов и серверов.
+
+    Запрос только читает текущий снимок. Раз в
+    POSTS_MODERATION_REFRESH_INTERVAL секунд версия сверяется в фоновом
+    потоке, и при изменении он подменяет снимок целиком. В потоке запроса
+    списки читаются только при первом обращении процесса и после их
+    изменения в этом же процессе.
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.checked_at = None
+        self.refreshing = False
+
+    def get(self):
+        snapshot = self.snapshot
+        if snapshot is None:
+            return self.load()
+        if self.is_due():
+            self.schedule_refresh()
+        return snapshot
+
+    def is_due(self):
+        interval = settings.POSTS_MODERATION_REFRESH_INTERVAL
+        checked_at = self.checked_at
+        return checked_at is None or time.monotonic() - checked_at >= interval
+
+    def load(self):
+        '''Читает списки в вызывающем потоке'''
+        with self.lock:
+            # Пока ждали блокировку, списки мог прочитать другой поток
+            if self.snapshot is None:
+                self.snapshot = load_snapshot()
+                self.checked_at = time.monotonic()
+            return self.snapshot
+
+    def schedule_refresh(self):
+        with self.lock:
+            if self.refreshing or not self.is_due():
+                return
+            self.refreshing = True
+        executor.submit(self._refresh_in_thread)
+
+    def refresh(self):
+        '''Сверяет версию с базой и при изменении подменяет снимок'''
+        started_at = time.monotonic()
+        current = self.snapshot
+        version = get_version()
+        if current is not None and version == current.version:
+            snapshot = current
+        else:
+            snapshot = load_snapshot()
+        with self.lock:
+            # Снимок, прочитанный за это время в запросе, новее
+            if self.snapshot is current:
+                self.snapshot = snapshot
+                self.checked_at = started_at
+
+    def _refresh_in_thread(self):
+        # Соединение с БД у потока своё: закрываем его после сверки
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception('Не удалось обновить списки модерации')
+            self.checked_at = time.monotonic()
+        finally:
+            self.refreshing = False
+            connections.close_all()
+
+    def invalidate(self):
+        self.snapshot = None
+
+
+lists = ModerationLists()
+
+
+def get_version():
+    return (
+        ModerationVersion.objects.filter(pk=VERSION_PK)
+        .values_list('version', flat=True).first()
+    ) or 0
+
+
+def bump_version():
+    '''
+    Списки изменились: остальные процессы перечитают их из базы. Версия
+    меняется в той же транзакции, что и списки, и откатывается вместе с ними
+    '''
+    updated = ModerationVersion.objects.filter(pk=VERSION_PK).update(
+        version=F('version') + 1
+    )
+    if not updated:
+        ModerationVersion.objects.get_or_create(
+            pk=VERSION_PK, defaults={'version': 1}
+        )
+    lists.invalidate()
+    transaction.on_commit(lists.invalidate)
+
+
+def get_allowed_email_domains():
+    return lists.get().email_domains
+
+
+def get_title_matcher():
+    return lists.get().title_matcher
@@ -0,0 +1,173 @@
+import json
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, F, Func, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    _reverse_ordering,
+)
+
+
+class KeysetCursorPagination(CursorPagination):
+    '''
+    Курсорная (keyset) пагинация по составному ключу (created_at, id).
+
+    В отличие от стандартной CursorPagination, в курсор кладутся имена и
+    значения всех полей сортировки, поэтому следующая страница выбирается
+    условием WHERE (created_at, id) < (..., ...) по индексу, без OFFSET.
+    Все поля сортировки идут в одном направлении, последнее должно быть
+    уникальным.
+    '''
+    ordering = ('-created_at', '-id')
+    page_size = settings.POSTS_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.POSTS_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor else None
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = self.filter_by_position(queryset, position, reverse)
+
+        # Берём на одну запись больше, чтобы узнать, есть ли следующая страница
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def filter_by_position(self, queryset, position, reverse):
+        '''
+        Сравнение строк (a, b) < (x, y): PostgreSQL проверяет его по
+        составному индексу как Index Cond, а не фильтром поверх скана
+        '''
+        descending = {field.startswith('-') for field in self.ordering}
+        assert len(descending) == 1, (
+            'Keyset pagination requires a single ordering direction.'
+        )
+        fields = [field.lstrip('-') for field in self.ordering]
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        # Курсор построен для другого порядка (например, поиска без ранга)
+        if not isinstance(values, dict) or list(values) != fields:
+            raise NotFound(self.invalid_cursor_message)
+
+        bounds = []
+        for attr, value in values.items():
+            output_field = queryset.query.resolve_ref(attr).output_field
+            try:
+                value = output_field.to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            bounds.append(Value(value, output_field=output_field))
+
+        operator = '<' if descending.pop() != reverse else '>'
+        return queryset.filter(RowComparison(
+            Row(*(F(attr) for attr in fields)), Row(*bounds),
+            operator=operator,
+        ))
+
+    def get_cursor_fields(self, request):
+        '''Поля сортировки, для которых построен курсор запроса, или None'''
+        try:
+            cursor = self.decode_cursor(request)
+        except NotFound:
+            return None
+        if cursor is None or cursor.position is None:
+            return None
+        try:
+            values = json.loads(cursor.position)
+        except ValueError:
+            return None
+        return list(values) if isinstance(values, dict) else None
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        else:
+            position = self.cursor.position
+        cursor = Cursor(offset=0, reverse=False, position=position)
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        else:
+            position = self.cursor.position
+        cursor = Cursor(offset=0, reverse=True, position=position)
+        return self.encode_cursor(cursor)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = {}
+        for field in ordering:
+            attr = field.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[attr]
+            else:
+                value = getattr(instance, attr)
+            # isoformat сохраняет микросекунды, иначе курсор потеряет точность
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            values[attr] = value
+        return json.dumps(values)
+
+
+class Row(Func):
+    '''Значение-строка ROW(a, b, ...)'''
+    function = 'ROW'
+
+
+class RowComparison(Func):
+    '''Лексикографическое сравнение двух строк: ROW(...) < ROW(...)'''
+    template = '%(expressions)s'
+    output_field = BooleanField()
+
+    def __init__(self, lhs, rhs, operator):
+        self.operator = operator
+        super().__init__(lhs, rhs)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, arg_joiner=f' {self.operator} ',
+            **extra_context
+        )
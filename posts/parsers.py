@@ -0,0 +1,34 @@
+'''
+Разбор JSON-тела запроса через orjson (extra orjson), например пакетов
+до POSTS_BULK_MAX_ITEMS элементов. Без пакета работает обычный
+JSONParser DRF.
+'''
+import codecs
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    '''
+    JSONParser на orjson для тел в UTF-8. Тела, которые orjson не принял
+    (ошибка синтаксиса, целое больше 64 бит), разбирает стандартный json:
+    так сообщения об ошибках остаются прежними
+    '''
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(body), media_type, parser_context)
@@ -17,4 +17,4 @@ class IsAdminOrAuthorOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in SAFE_METHODS:
             return True
-        return request.user.is_staff or obj.author == request.user
+        return request.user.is_staff or obj.author_id == request.user.id
@@ -0,0 +1,75 @@
+'''
+JSON-ответы через orjson (extra orjson): на больших списках он в разы
+быстрее стандартного json. Без пакета и в режимах, которых orjson не
+умеет (отступ, ensure_ascii, некомпактный вывод), работает обычный
+JSONRenderer DRF.
+'''
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Даты и время orjson пишет сам, а UTC, как и DRF, — с суффиксом Z
+ORJSON_OPTIONS = (
+    orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+)
+
+
+def has_foreign_float(data):
+    '''
+    Есть ли float, который orjson запишет не так, как json: с порядком
+    (1e16 против 1e+16, 1e-07 против 1e-7) или NaN и бесконечность,
+    которые orjson молча пишет null
+    '''
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            # NaN не проходит ни одно сравнение
+            if not (value == 0 or 1e-4 <= abs(value) < 1e16):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    '''
+    JSONRenderer на orjson. Decimal, ленивые строки gettext_lazy и прочие
+    типы, которых orjson не знает, преобразует кодировщик DRF. Если
+    orjson не справился (например, целое больше 64 бит) или в данных
+    есть float, который он запишет иначе (has_foreign_float), ответ
+    строит стандартный json: тот же текст, а NaN при STRICT_JSON — та же
+    ValueError
+    '''
+    encoder = JSONEncoder()
+
+    def default(self, obj):
+        value = self.encoder.default(obj)
+        if has_foreign_float(value):
+            raise TypeError('float, который orjson запишет иначе')
+        return value
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (orjson is None or indent is not None or self.ensure_ascii
+                or not self.compact or has_foreign_float(data)):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и DRF: JSON остаётся подмножеством JavaScript
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
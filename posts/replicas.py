@@ -0,0 +1,91 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+
+PRIMARY_PIN_COOKIE = 'posts_primary'
+
+# Читать из реплики можно только внутри безопасного запроса к API;
+# команды, админка, сигналы и всё остальное работают с основной БД
+_read_from_replica = ContextVar('posts_read_from_replica', default=False)
+
+
+def reading_from_replica():
+    return _read_from_replica.get()
+
+
+def replica_reads():
+    '''Пойдут ли чтения текущего запроса в реплику'''
+    return bool(settings.DATABASE_REPLICAS) and _read_from_replica.get()
+
+
+@contextmanager
+def primary_reads():
+    '''
+    Чтение внутри блока — из основной БД: то, что кешируется или
+    получает ETag по поколению, не должно собираться из отстающей реплики
+    '''
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    '''
+    Чтение в безопасных запросах к API — из реплик, запись и всё
+    остальное — в основную БД. После первой записи запрос до конца
+    читает из основной БД, чтобы видеть свои изменения.
+    '''
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and _read_from_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _read_from_replica.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная БД
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    '''
+    GET/HEAD/OPTIONS читают из реплики, если клиент недавно ничего не
+    записывал. После записи ответ ставит cookie, и следующие
+    POSTS_PRIMARY_PIN_SECONDS секунд клиент читает из основной БД.
+    '''
+
+    def dispatch(self, request, *args, **kwargs):
+        use_replica = (
+            request.method in SAFE_METHODS
+            and PRIMARY_PIN_COOKIE not in request.COOKIES
+        )
+        token = _read_from_replica.set(use_replica)
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+            # Запись могла случиться и внутри безопасного запроса
+            wrote = request.method not in SAFE_METHODS or (
+                use_replica and not _read_from_replica.get()
+            )
+        finally:
+            _read_from_replica.reset(token)
+
+        if wrote and response.status_code < 400:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE, '1',
+                max_age=settings.POSTS_PRIMARY_PIN_SECONDS,
+                httponly=True, samesite='Lax'
+            )
+        return response
@@ -0,0 +1,79 @@
+'''
+Полнотекстовый поиск ?search= по векторам search_vector, которые
+поддерживает триггер БД. Запрос разбирается как в поисковиках
+(websearch_to_tsquery): слова, "фраза", or, -исключение.
+'''
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend
+
+from .constants import SEARCH_CONFIG
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    '''
+    Оставляет записи, совпавшие с запросом, и сортирует их по
+    релевантности. Курсорная пагинация берёт порядок из get_ordering.
+
+    ts_rank читает вектор каждого совпадения, и для частого слова это
+    секунды. Поэтому если совпадений больше POSTS_SEARCH_RANK_LIMIT
+    (проверяется запросом с OFFSET по индексу), выдача идёт в порядке
+    пагинации — новые сначала, — который PostgreSQL отдаёт постранично.
+    Порог проверяется на первой странице, следующие идут в порядке
+    курсора, даже если число совпадений тем временем перешло порог.
+    '''
+    search_param = 'search'
+    ordering = ('-search_rank', '-id')
+
+    def get_search_query(self, request):
+        value = request.query_params.get(self.search_param, '').strip()
+        if not value:
+            return None
+        return SearchQuery(
+            value, config=SEARCH_CONFIG, search_type='websearch'
+        )
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if query is None:
+            return queryset
+        matches = queryset.filter(search_vector=query)
+        if not self.is_ranked(request, matches, view):
+            return matches
+        # real из ts_rank приводится к double precision: такое значение
+        # без потерь переживает JSON в курсоре и сравнение на следующей
+        # странице
+        return matches.annotate(
+            search_rank=Cast(
+                SearchRank(F('search_vector'), query), FloatField()
+            )
+        )
+
+    def is_ranked(self, request, matches, view):
+        '''Сортировать ли выдачу по рангу'''
+        paginator = getattr(view, 'paginator', None)
+        if paginator is not None and hasattr(paginator, 'get_cursor_fields'):
+            fields = paginator.get_cursor_fields(request)
+            if fields is not None:
+                return 'search_rank' in fields
+        limit = settings.POSTS_SEARCH_RANK_LIMIT
+        return not matches.order_by().values('pk')[limit:].exists()
+
+    def get_ordering(self, request, queryset, view):
+        # Без поиска (и в действиях без filter_queryset) — порядок пагинации
+        if 'search_rank' in queryset.query.annotations:
+            return self.ordering
+        return None
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': (
+                'Полнотекстовый поиск, результаты по убыванию релевантности'
+            ),
+            'schema': {'type': 'string'},
+        }]
@@ -1,8 +1,25 @@
+import os
+
 from rest_framework import serializers
+from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import OuterRef, Subquery
+from PIL import Image
 from rest_framework.exceptions import PermissionDenied
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenObtainSlidingSerializer
+)
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 
+from .authentication import user_claims
+from .constants import LATEST_COMMENTS_LIMIT
+from .fast import ReadField, ReadPlan, column
 from .models import Post, Comment
+from .sparse import SparseFieldsSerializerMixin
+from .uploads import UploadRejected, check_pixels, content_hash
 from .validators import (
     validate_password,
     validate_email,
@@ -13,13 +30,122 @@ from .validators import (
 User = get_user_model()
 
 
+def latest_comments_queryset():
+    '''
+    Последние LATEST_COMMENTS_LIMIT комментариев каждого поста. Подзапрос
+    коррелирован с постом и выполняется только для строк страницы
+    '''
+    latest_ids = (
+        Comment.objects.filter(post=OuterRef('post'))
+        .order_by('-created_at', '-id')
+        .values('pk')[:LATEST_COMMENTS_LIMIT]
+    )
+    return Comment.objects.filter(
+        pk__in=Subquery(latest_ids)
+    ).defer('search_vector').order_by('-created_at', '-id')
+
+
+def image_variant_urls(image, variants, storage, request=None):
+    '''
+    {вариант: url} для изображения с именем image. Пустой словарь, если
+    варианты построены для другого файла или ещё не построены
+    '''
+    if not image or variants.get('source') != image:
+        return {}
+    urls = {}
+    for name, path in variants['files'].items():
+        url = storage.url(path)
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        urls[name] = url
+    return urls
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    '''
+    При пакетной валидации объекты берутся из словаря context[preload_key],
+    собранного одним запросом, а не запросом на каждый элемент
+    '''
+
+    def __init__(self, preload_key, **kwargs):
+        self.preload_key = preload_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get(self.preload_key)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in preloaded:
+            self.fail('does_not_exist', pk_value=data)
+        return preloaded[pk]
+
+
+class HeaderOnlyImageField(forms.ImageField):
+    '''
+    В запросе Pillow читает только заголовок файла. Полное декодирование
+    и проверка данных — в фоновой обработке (posts.images)
+    '''
+
+    def to_python(self, data):
+        f = forms.FileField.to_python(self, data)
+        if f is None:
+            return None
+        if hasattr(data, 'temporary_file_path'):
+            file = data.temporary_file_path()
+        else:
+            file = data
+        try:
+            with Image.open(file) as image:
+                f.content_type = Image.MIME.get(image.format)
+                size = image.size
+        except Exception as exc:
+            raise forms.ValidationError(
+                self.error_messages['invalid_image'], code='invalid_image'
+            ) from exc
+        try:
+            check_pixels(*size)
+        except UploadRejected as exc:
+            raise forms.ValidationError(str(exc), code='too_many_pixels')
+        if hasattr(f, 'seek') and callable(f.seek):
+            f.seek(0)
+        return f
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageVariantsField(serializers.Field):
+    '''
+    Ссылки на уменьшенные копии изображения поста, {вариант: url}.
+    Пустой словарь, пока варианты текущего изображения не построены
+    '''
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, post):
+        return image_variant_urls(
+            post.image.name, post.image_variants, post.image.storage,
+            self.context.get('request')
+        )
+
+
 class UserSerializer(serializers.ModelSerializer):
     '''Сериализатор для пользователей'''
     password = serializers.CharField(write_only=True)
 
     class Meta:
         model = User
-        fields = ('id', 'username', 'email', 'password', 'phone', 'birth_date')
+        fields = (
+            'id', 'username', 'email', 'password', 'phone', 'birth_date',
+            'post_count', 'comment_count'
+        )
 
     def validate_password(self, value):
         validate_password(value)
@@ -40,58 +166,187 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class PostSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
+    '''Сериализатор для комментариев'''
     author = serializers.PrimaryKeyRelatedField(read_only=True)
-    image = serializers.ImageField(required=False, allow_null=True)
+    # str(post) в форме browsable API обращается к автору поста
+    post = PreloadedPrimaryKeyRelatedField(
+        preload_key='preloaded_posts',
+        queryset=Post.objects.select_related('author')
+    )
 
     class Meta:
-        model = Post
-        fields = '__all__'
+        model = Comment
+        exclude = ('search_vector',)
 
-    def validate_title(self, value):
-        validate_post_title(value)
-        return value
+    def create(self, validated_data):
+        validated_data['author_id'] = self.context['request'].user.id
+        return super().create(validated_data)
+
+    @staticmethod
+    def check_author(user):
+        if not user.is_authenticated:
+            raise PermissionDenied(
+                'Неавторизованный пользователь не может оставлять '
+                'комментарии'
+            )
+        if user.is_staff:
+            raise PermissionDenied(
+                'Администратор не может оставлять комментарии'
+            )
 
     def validate(self, data):
         request = self.context['request']
-        user = request.user
-        if request.method == 'POST':
-            if not user.is_authenticated:
-                raise PermissionDenied(
-                    'Неавторизованный пользователь не может '
-                    'создавать посты'
-                )
-            if user.is_staff:
-                raise PermissionDenied(
-                    'Администратор не может создавать посты'
-                )
-            validate_user_age(user.birth_date)
+        # При пакетном создании автор проверяется один раз на запрос
+        if request.method == 'POST' and not self.context.get('bulk'):
+            self.check_author(request.user)
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    '''Сериализатор для комментариев'''
+class PostSerializer(SparseFieldsSerializerMixin,
+                     serializers.ModelSerializer):
     author = serializers.PrimaryKeyRelatedField(read_only=True)
+    image = serializers.ImageField(
+        required=False, allow_null=True,
+        _DjangoImageField=HeaderOnlyImageField
+    )
+    image_variants = ImageVariantsField()
+    comment_count = serializers.IntegerField(read_only=True)
+    latest_comments = serializers.SerializerMethodField()
+    # Начало текста для карточек в списке, только по ?fields=text_preview
+    text_preview = serializers.SerializerMethodField()
+
+    optional_fields = ('text_preview',)
 
     class Meta:
-        model = Comment
-        fields = '__all__'
+        model = Post
+        exclude = ('search_vector',)
 
-    def create(self, validated_data):
-        validated_data['author'] = self.context['request'].user
-        return super().create(validated_data)
+    @staticmethod
+    def truncate_preview(preview):
+        # Лишний символ показывает, что текст обрезан
+        length = settings.POSTS_TEXT_PREVIEW_LENGTH
+        if len(preview) > length:
+            return preview[:length].rstrip() + '…'
+        return preview
+
+    @extend_schema_field(OpenApiTypes.STR)
+    def get_text_preview(self, obj):
+        # В списке приходит аннотацией: длинный text из БД не читается
+        preview = getattr(obj, 'text_preview', None)
+        if preview is None:
+            preview = obj.text[:settings.POSTS_TEXT_PREVIEW_LENGTH + 1]
+        return self.truncate_preview(preview)
+
+    @extend_schema_field(CommentSerializer(many=True))
+    def get_latest_comments(self, obj):
+        # Список приходит через Prefetch из PostViewSet.get_queryset
+        if hasattr(obj, 'prefetched_latest_comments'):
+            comments = obj.prefetched_latest_comments
+        else:
+            comments = obj.comments.order_by(
+                '-created_at', '-id'
+            )[:LATEST_COMMENTS_LIMIT]
+        return CommentSerializer(
+            comments, many=True, context=self.context
+        ).data
+
+    # Поля для posts.fast.ReadPlan: значения из строк values()
+
+    def read_image_variants(self):
+        storage = Post._meta.get_field('image').storage
+        request = self.context.get('request')
+        return ReadField(
+            ('image', 'image_variants'),
+            lambda row: image_variant_urls(
+                row['image'], row['image_variants'], storage, request
+            )
+        )
+
+    def read_text_preview(self):
+        # Аннотацию добавляет PostViewSet.get_queryset
+        return column('text_preview', self.truncate_preview)
+
+    def read_latest_comments(self):
+        plan = ReadPlan(CommentSerializer(context=self.context))
+        columns = dict.fromkeys((*plan.columns, 'post_id'))
+        latest = {}
+
+        def prepare(rows):
+            # Комментарии всей страницы одним запросом, как Prefetch
+            comments = list(
+                latest_comments_queryset()
+                .filter(post_id__in=[row['id'] for row in rows])
+                .values(*columns)
+            )
+            latest.clear()
+            for comment, data in zip(comments, plan.serialize(comments)):
+                latest.setdefault(comment['post_id'], []).append(data)
+
+        return ReadField(
+            ('id',), lambda row: latest.get(row['id'], []), prepare
+        )
+
+    def validate_title(self, value):
+        validate_post_title(value)
+        return value
+
+    def validate_image(self, value):
+        '''
+        Файл называется по sha256 содержимого: повторная загрузка той же
+        картинки ссылается на уже сохранённый файл, а не пишет копию
+        '''
+        if value is None:
+            return value
+        extension = os.path.splitext(value.name)[1].lower()
+        value.name = f'{content_hash(value)}{extension}'
+        field = Post._meta.get_field('image')
+        name = field.generate_filename(None, value.name)
+        if field.storage.exists(name):
+            return name
+        return value
+
+    @staticmethod
+    def check_author(user):
+        if not user.is_authenticated:
+            raise PermissionDenied(
+                'Неавторизованный пользователь не может '
+                'создавать посты'
+            )
+        if user.is_staff:
+            raise PermissionDenied(
+                'Администратор не может создавать посты'
+            )
+        validate_user_age(user.birth_date)
 
     def validate(self, data):
         request = self.context['request']
-        user = request.user
-        if request.method == 'POST':
-            if not user.is_authenticated:
-                raise PermissionDenied(
-                    'Неавторизованный пользователь не может оставлять '
-                    'комментарии'
-                )
-            if user.is_staff:
-                raise PermissionDenied(
-                    'Администратор не может оставлять комментарии'
-                )
+        # При пакетном создании автор проверяется один раз на запрос
+        if request.method == 'POST' and not self.context.get('bulk'):
+            self.check_author(request.user)
         return data
+
+
+class ClaimsTokenMixin:
+    '''
+    В токены добавляются is_staff и birth_date: по ним
+    StatelessJWTAuthentication строит пользователя без запроса к БД
+    '''
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class ClaimsTokenObtainPairSerializer(ClaimsTokenMixin,
+                                      TokenObtainPairSerializer):
+    pass
+
+
+class ClaimsTokenObtainSlidingSerializer(ClaimsTokenMixin,
+                                         TokenObtainSlidingSerializer):
+    pass
@@ -0,0 +1,75 @@
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from . import counters
+from .cache import invalidate, invalidate_comments
+from .images import enqueue_post_image
+from .models import (AllowedEmailDomain, BannedTitleWord, Comment, Post,
+                     User)
+from .moderation import bump_version
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_lists(sender, **kwargs):
+    invalidate('posts')
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_lists(sender, **kwargs):
+    invalidate('users')
+
+
+@receiver(post_save, sender=Post)
+def queue_image_variants(sender, instance, **kwargs):
+    # Новое изображение: варианты строятся в фоне
+    if instance.image and \
+            instance.image_variants.get('source') != instance.image.name:
+        enqueue_post_image(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_comment_lists(sender, instance, **kwargs):
+    # Зарегистрирован раньше update_counters: _counter_keys ещё хранит
+    # пост, из которого комментарий могли перенести
+    previous = getattr(instance, '_counter_keys', {}).get('post_id')
+    invalidate_comments(instance.post_id, previous)
+
+
+@receiver(post_init, sender=Post)
+@receiver(post_init, sender=Comment)
+def remember_counter_keys(sender, instance, **kwargs):
+    # Ключи на момент загрузки: по ним видно, что запись сменила пост
+    # или автора
+    instance._counter_keys = counters.tracked_keys(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def update_counters(sender, instance, created, **kwargs):
+    current = counters.tracked_keys(instance)
+    if created:
+        counters.change(sender, [current], 1)
+    else:
+        counters.moved(sender, instance._counter_keys, current)
+    instance._counter_keys = current
+
+
+@receiver(pre_delete, sender=Post)
+@receiver(pre_delete, sender=User)
+def start_cascade(sender, instance, **kwargs):
+    # pre_delete приходит по всем записям каскада раньше первого post_delete
+    counters.cascade.start(sender, instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=User)
+def decrement_counters(sender, instance, **kwargs):
+    counters.deleted(sender, instance)
+
+
+@receiver([post_save, post_delete], sender=AllowedEmailDomain)
+@receiver([post_save, post_delete], sender=BannedTitleWord)
+def reload_moderation_lists(sender, **kwargs):
+    bump_version()
@@ -0,0 +1,133 @@
+'''
+Выбор полей ответа: ?fields=id,title оставляет перечисленные поля,
+?omit=text убирает лишние. В списках выбор сужает и SQL: через only()
+читаются только нужные столбцы, поэтому длинный text не покидает БД,
+если клиенту нужны одни заголовки.
+'''
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.functional import cached_property
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ALL_FIELDS
+
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        'fields', str,
+        description='Поля ответа через запятую'
+    ),
+    OpenApiParameter('omit', str, description='Поля, которые не выводить'),
+]
+
+
+def parse_names(value):
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsSerializerMixin:
+    '''
+    Сериализатор, который выводит только поля из fields (None — все,
+    кроме optional_fields; ALL_FIELDS — все). optional_fields попадают
+    в ответ только по явному запросу
+    '''
+    optional_fields = ()
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+
+    def get_fields(self):
+        fields = super().get_fields()
+        keep = self.sparse_fields
+        if keep == ALL_FIELDS:
+            return fields
+        for name in list(fields):
+            if keep is None:
+                drop = name in self.optional_fields
+            else:
+                drop = name not in keep
+            if drop:
+                del fields[name]
+        return fields
+
+
+class SparseFieldsetsMixin:
+    '''
+    ?fields= / ?omit= для безопасных запросов. Сериализатор должен
+    наследовать SparseFieldsSerializerMixin. Столбцы для полей без
+    прямого соответствия в модели задаются в sparse_columns
+    '''
+    fields_param = 'fields'
+    omit_param = 'omit'
+    # Поле сериализатора → столбцы модели, которые нужны для его значения
+    sparse_columns = {}
+
+    @cached_property
+    def serializer_fields(self):
+        '''Все поля сериализатора, включая необязательные'''
+        return self.get_serializer_class()(fields=ALL_FIELDS).fields
+
+    @cached_property
+    def sparse_fields(self):
+        '''Множество полей ответа или None, если выбор не задан'''
+        if self.request.method not in SAFE_METHODS:
+            return None
+        params = self.request.query_params
+        requested = parse_names(params.get(self.fields_param))
+        omitted = parse_names(params.get(self.omit_param))
+        if requested is None and omitted is None:
+            return None
+
+        available = set(self.serializer_fields)
+        for param, names in ((self.fields_param, requested),
+                             (self.omit_param, omitted)):
+            unknown = (names or set()) - available
+            if unknown:
+                raise ValidationError({param: [
+                    f'Неизвестные поля: {", ".join(sorted(unknown))}'
+                ]})
+        if requested is None:
+            optional = self.get_serializer_class().optional_fields
+            requested = available - set(optional)
+        return frozenset(requested - (omitted or set()))
+
+    def wants_field(self, name):
+        '''Попадёт ли поле в ответ'''
+        if self.sparse_fields is None:
+            return name not in self.get_serializer_class().optional_fields
+        return name in self.sparse_fields
+
+    def get_sparse_columns(self, model):
+        '''Столбцы для only(): ключ, поля сортировки и нужные полям ответа'''
+        columns = {model._meta.pk.name}
+        columns.update(
+            name.lstrip('-') for name in self.pagination_class.ordering
+        )
+        for name in self.sparse_fields:
+            if name in self.sparse_columns:
+                columns.update(self.sparse_columns[name])
+                continue
+            source = self.serializer_fields[name].source
+            try:
+                field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                columns.add(field.name)
+        return columns
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Детальный ответ — одна строка, а ETag в ConditionalGetMixin
+        # считается по полной записи
+        if self.action != 'list' or self.sparse_fields is None:
+            return queryset
+        return queryset.only(*self.get_sparse_columns(queryset.model))
+
+    def get_serializer(self, *args, **kwargs):
+        if self.sparse_fields is not None:
+            kwargs.setdefault('fields', self.sparse_fields)
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,31 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountMixin:
+    '''
+    Помощник для тестов: число SQL-запросов на один запрос к списку
+    не должно зависеть от количества строк (защита от N+1).
+    '''
+
+    def count_queries(self, url, **extra):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, **extra)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, add_rows, num=None, **extra):
+        '''
+        Запрашивает url, добавляет строки через add_rows(n) и запрашивает
+        снова: число запросов должно совпасть (и равняться num, если задано).
+        '''
+        add_rows(1)
+        few = self.count_queries(url, **extra)
+        add_rows(10)
+        many = self.count_queries(url, **extra)
+        self.assertEqual(
+            few, many,
+            f'{url}: {few} запросов на 1 строку, {many} — на 11 строк'
+        )
+        if num is not None:
+            self.assertEqual(many, num)
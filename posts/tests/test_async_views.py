@@ -0,0 +1,90 @@
+import asyncio
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from posts.models import Post, Comment
+
+
+User = get_user_model()
+
+
+# Запросы выполняются в потоках пула со своими соединениями, поэтому
+# данные должны быть зафиксированы, а не жить в транзакции теста
+class AsyncViewsTestCase(APITransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.user, title='Title', text='Text'
+        )
+        self.comment = Comment.objects.create(
+            author=self.user, post=self.post, text='Comment'
+        )
+
+    def count_connections(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT count(*) FROM pg_stat_activity '
+                'WHERE datname = current_database()'
+            )
+            return cursor.fetchone()[0]
+
+    def test_pool_threads_close_connections(self):
+        before = self.count_connections()
+        for _ in range(3):
+            response = self.client.get(reverse('async-post-list'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.count_connections(), before)
+
+    def test_post_list_matches_sync(self):
+        sync = self.client.get(reverse('post-list'))
+        response = self.client.get(reverse('async-post-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), sync.json())
+
+    def test_post_detail_matches_sync(self):
+        self.client.force_login(self.user)
+        sync = self.client.get(reverse('post-detail', args=[self.post.id]))
+        response = self.client.get(
+            reverse('async-post-detail', args=[self.post.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), sync.json())
+        self.assertEqual(response['ETag'], sync['ETag'])
+
+    def test_comment_list_filter_and_not_modified(self):
+        url = reverse('async-comment-list')
+        response = self.client.get(url, {'post': self.post.id})
+        self.assertEqual(len(response.json()['results']), 1)
+
+        response = self.client.get(
+            url, {'post': self.post.id}, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_comment_detail_not_found(self):
+        self.client.force_login(self.user)
+        url = reverse('async-comment-detail', args=[self.comment.id + 100])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_concurrent_requests(self):
+        client = AsyncClient()
+        url = reverse('async-post-list')
+
+        async def fetch():
+            return await asyncio.gather(*(client.get(url) for _ in range(5)))
+
+        responses = asyncio.run(fetch())
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_200_OK] * 5
+        )
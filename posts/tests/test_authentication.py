@@ -0,0 +1,166 @@
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from posts.authentication import active_users
+from posts.models import Post
+
+
+User = get_user_model()
+
+
+class StatelessJWTAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        active_users.clear()
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.user, title='Title', text='Text'
+        )
+
+    def obtain(self, username, password):
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': username, 'password': password}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['access']
+
+    def authorize(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_token_contains_claims(self):
+        token = AccessToken(self.obtain('user', 'user'))
+        self.assertEqual(token['user_id'], self.user.id)
+        self.assertFalse(token['is_staff'])
+        self.assertEqual(token['birth_date'], '2000-01-01')
+
+    def test_user_loaded_once_per_interval(self):
+        self.authorize(self.obtain('user', 'user'))
+        url = reverse('comment-list')
+        # Проверка активности пользователя и страница
+        with self.assertNumQueries(2):
+            self.client.get(url)
+        # Пользователь берётся из токена, активность — из кеша процесса
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create_post_from_claims(self):
+        self.authorize(self.obtain('user', 'user'))
+        response = self.client.post(
+            reverse('post-list'), {'title': 'New', 'text': 'Text'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['author'], self.user.id)
+
+    def test_underage_checked_from_claims(self):
+        User.objects.create_user(
+            username='young', password='young', birth_date='2015-01-01'
+        )
+        self.authorize(self.obtain('young', 'young'))
+        response = self.client.post(
+            reverse('post-list'), {'title': 'New', 'text': 'Text'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_author_permissions_from_claims(self):
+        other = User.objects.create_user(
+            username='other', password='other', birth_date='2000-01-01'
+        )
+        self.authorize(self.obtain('other', 'other'))
+        url = reverse('post-detail', args=[self.post.id])
+        response = self.client.patch(url, {'text': 'Changed'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.authorize(self.obtain('user', 'user'))
+        response = self.client.patch(url, {'text': 'Changed'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(other.posts.count(), 0)
+
+    @override_settings(POSTS_JWT_USER_CHECK_INTERVAL=0)
+    def test_deactivated_user_rejected(self):
+        self.authorize(self.obtain('user', 'user'))
+        url = reverse('post-detail', args=[self.post.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(POSTS_JWT_USER_CHECK_INTERVAL=0)
+    def test_staff_change_overrides_claims(self):
+        url = reverse('post-list')
+        data = {'title': 'New', 'text': 'Text'}
+        self.authorize(self.obtain('user', 'user'))
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        # Администратор не может создавать посты, хотя в токене is_staff=False
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        User.objects.filter(pk=self.user.pk).update(is_staff=False)
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_token_without_claims_uses_database(self):
+        self.authorize(RefreshToken.for_user(self.user).access_token)
+        response = self.client.post(
+            reverse('post-list'), {'title': 'New', 'text': 'Text'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class TokenEndpointsTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+
+    def obtain(self, name):
+        return self.client.post(
+            reverse(name), {'username': 'user', 'password': 'user'}
+        )
+
+    def test_login_rehashes_old_password(self):
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password('user', hasher='pbkdf2_sha256')
+        )
+        response = self.obtain('token_obtain_pair')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('argon2$'))
+        self.assertTrue(self.user.check_password('user'))
+
+    def test_refresh_and_verify(self):
+        refresh = self.obtain('token_obtain_pair').data['refresh']
+        response = self.client.post(
+            reverse('token_refresh'), {'refresh': refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        access = response.data['access']
+        self.assertEqual(AccessToken(access)['birth_date'], '2000-01-01')
+
+        response = self.client.post(reverse('token_verify'), {'token': access})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('token_verify'), {'token': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_sliding_token(self):
+        token = self.obtain('token_obtain_sliding').data['token']
+        response = self.client.post(
+            reverse('token_refresh_sliding'), {'token': token}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.data["token"]}'
+        )
+        response = self.client.post(
+            reverse('post-list'), {'title': 'New', 'text': 'Text'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
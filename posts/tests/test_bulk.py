@@ -0,0 +1,192 @@
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts.constants import BANNED_TITLE_WORDS
+from posts.models import Post, Comment
+
+
+User = get_user_model()
+
+
+class BulkCreateTestCase(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', password='admin', birth_date='1990-01-01'
+        )
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.underage = User.objects.create_user(
+            username='young', password='young', birth_date='2015-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.user, title='Title', text='Text'
+        )
+
+    def test_bulk_create_comments(self):
+        self.client.login(username='user', password='user')
+        data = [
+            {'post': self.post.id, 'text': f'Comment {i}'} for i in range(50)
+        ]
+        # Сессия, пользователь, посты одним запросом, транзакция с INSERT
+        # и двумя обновлениями счётчиков (пост и автор)
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                reverse('comment-bulk-create'), data, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 50)
+        self.assertEqual(Comment.objects.filter(author=self.user).count(), 50)
+        self.assertEqual(
+            response.data['results'][0]['data']['text'], 'Comment 0'
+        )
+
+    def test_bulk_create_reports_partial_failures(self):
+        self.client.login(username='user', password='user')
+        data = [
+            {'post': self.post.id, 'text': 'Ok'},
+            {'post': self.post.id + 100, 'text': 'Unknown post'},
+            {'post': self.post.id, 'text': ''},
+            'not an object',
+            {'post': '²', 'text': 'Not a number'},
+        ]
+        response = self.client.post(
+            reverse('comment-bulk-create'), data, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['failed'], 4)
+        results = response.data['results']
+        self.assertIn('data', results[0])
+        self.assertIn('post', results[1]['errors'])
+        self.assertIn('text', results[2]['errors'])
+        self.assertIn('non_field_errors', results[3]['errors'])
+        self.assertIn('post', results[4]['errors'])
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_bulk_create_posts(self):
+        self.client.login(username='user', password='user')
+        data = [
+            {'title': 'First', 'text': 'Text'},
+            {'title': f'Это {BANNED_TITLE_WORDS[0]}', 'text': 'Text'},
+        ]
+        response = self.client.post(
+            reverse('post-bulk-create'), data, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        created = response.data['results'][0]['data']
+        self.assertEqual(created['author'], self.user.id)
+        self.assertEqual(created['comment_count'], 0)
+        self.assertIn('title', response.data['results'][1]['errors'])
+
+    def test_bulk_create_all_invalid(self):
+        self.client.login(username='user', password='user')
+        response = self.client.post(
+            reverse('post-bulk-create'), [{'title': ''}], format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_requires_list(self):
+        self.client.login(username='user', password='user')
+        for data in ({'title': 'T', 'text': 'T'}, []):
+            response = self.client.post(
+                reverse('post-bulk-create'), data, format='json'
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_bulk_create_checks_author_once(self):
+        data = [{'title': 'T', 'text': 'T'}]
+        url = reverse('post-bulk-create')
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.login(username='admin', password='admin')
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.login(username='young', password='young')
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Post.objects.filter(title='T').exists())
+
+    def test_bulk_update_comments(self):
+        other_post = Post.objects.create(
+            author=self.user, title='Other', text='Text'
+        )
+        own = [
+            Comment.objects.create(
+                author=self.user, post=self.post, text=f'Comment {i}'
+            )
+            for i in range(3)
+        ]
+        foreign = Comment.objects.create(
+            author=self.underage, post=self.post, text='Foreign'
+        )
+        self.client.login(username='user', password='user')
+        data = [
+            {'id': own[0].id, 'text': 'Edited'},
+            {'id': own[1].id, 'post': other_post.id},
+            {'id': foreign.id, 'text': 'Not mine'},
+            {'id': own[0].id, 'text': 'Twice'},
+            {'id': own[2].id, 'text': ''},
+            {'id': '²', 'text': 'Bad id'},
+            {'id': foreign.id + 100, 'text': 'Unknown'},
+        ]
+        response = self.client.patch(
+            reverse('comment-bulk-create'), data, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['updated'], 2)
+        results = response.data['results']
+        self.assertEqual(results[0]['data']['text'], 'Edited')
+        self.assertEqual(results[1]['data']['post'], other_post.id)
+        self.assertIn('non_field_errors', results[2]['errors'])
+        for index, field in ((3, 'id'), (4, 'text'), (5, 'id'), (6, 'id')):
+            self.assertIn(field, results[index]['errors'])
+
+        own[0].refresh_from_db()
+        self.assertEqual(own[0].text, 'Edited')
+        self.assertGreater(own[0].updated_at, own[0].created_at)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.text, 'Foreign')
+        # Счётчики перенесённого комментария
+        self.post.refresh_from_db()
+        other_post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 3)
+        self.assertEqual(other_post.comment_count, 1)
+
+    def test_bulk_update_posts(self):
+        posts = [
+            Post.objects.create(author=self.user, title=f'T{i}', text='Text')
+            for i in range(20)
+        ]
+        self.client.login(username='user', password='user')
+        data = [{'id': post.id, 'title': f'New {post.id}'} for post in posts]
+        # Сессия, пользователь, объекты с превью комментариев, транзакция
+        # с одним UPDATE
+        with self.assertNumQueries(7):
+            response = self.client.patch(
+                reverse('post-bulk-create'), data, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Post.objects.filter(title__startswith='New').count(), 20
+        )
+
+        data = [{'id': self.post.id, 'title': BANNED_TITLE_WORDS[0]}]
+        response = self.client.patch(
+            reverse('post-bulk-create'), data, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('title', response.data['results'][0]['errors'])
+
+    def test_bulk_update_requires_authentication(self):
+        response = self.client.patch(
+            reverse('post-bulk-create'),
+            [{'id': self.post.id, 'title': 'T'}], format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,119 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts.models import Post, Comment
+
+
+User = get_user_model()
+
+
+# Кеш LocMem общий для всех запросов процесса тестов
+@override_settings(POSTS_CACHE_SHARED=True)
+class ListCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            username='admin', password='admin', birth_date='1990-01-01'
+        )
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.user, title='Title', text='Text'
+        )
+
+    def get_list(self, name='post-list', **params):
+        return self.client.get(reverse(name), params)
+
+    def test_second_anonymous_request_is_served_from_cache(self):
+        first = self.get_list()
+        second = self.get_list()
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+
+    def test_key_depends_on_query_params(self):
+        self.get_list()
+        response = self.get_list(page_size=1)
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_new_post_invalidates_post_list(self):
+        self.get_list()
+        Post.objects.create(author=self.user, title='New', text='Text')
+        response = self.get_list()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_new_comment_invalidates_post_and_comment_lists(self):
+        self.get_list()
+        self.get_list('comment-list')
+        Comment.objects.create(author=self.user, post=self.post, text='C')
+        posts = self.get_list()
+        comments = self.get_list('comment-list')
+        self.assertEqual(posts['X-Cache'], 'MISS')
+        self.assertEqual(posts.data['results'][0]['comment_count'], 1)
+        self.assertEqual(comments['X-Cache'], 'MISS')
+
+    def test_comment_invalidates_only_its_post_comments(self):
+        other = Post.objects.create(author=self.user, title='B', text='B')
+        own = reverse('post-comments', args=[self.post.id])
+        unrelated = reverse('post-comments', args=[other.id])
+        self.client.get(own)
+        self.client.get(unrelated)
+        comment = Comment.objects.create(
+            author=self.user, post=self.post, text='C'
+        )
+        self.assertEqual(self.client.get(own)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(unrelated)['X-Cache'], 'HIT')
+
+        # Перенос комментария сбрасывает страницы обоих постов
+        comment.post = other
+        comment.save()
+        self.assertEqual(self.client.get(own)['X-Cache'], 'MISS')
+        response = self.client.get(unrelated)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_comment_change_keeps_unrelated_namespace(self):
+        self.get_list('comment-list')
+        Post.objects.create(author=self.user, title='New', text='Text')
+        response = self.get_list('comment-list')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_delete_through_api_invalidates(self):
+        self.get_list()
+        self.client.force_authenticate(self.admin)
+        url = reverse('post-detail', args=[self.post.id])
+        self.client.delete(url)
+        self.client.force_authenticate(None)
+        response = self.get_list()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'], [])
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(self.user)
+        response = self.get_list()
+        self.assertNotIn('X-Cache', response)
+
+    @override_settings(POSTS_CACHE_SHARED=False)
+    def test_cache_is_off_without_shared_cache(self):
+        self.get_list()
+        response = self.get_list()
+        self.assertNotIn('X-Cache', response)
+
+    def test_stats(self):
+        self.get_list()
+        self.get_list()
+        self.get_list()
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('cache_stats'))
+        self.assertEqual(response.data, {'hits': 2, 'misses': 1})
+
+    def test_stats_are_staff_only(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('cache_stats'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from posts.models import Comment, Post
+
+
+User = get_user_model()
+
+
+def seed(**options):
+    call_command('create_test_data', stdout=StringIO(), **options)
+
+
+class CreateTestDataTestCase(TestCase):
+    def test_default_volume(self):
+        seed()
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(Post.objects.count(), 15)
+        self.assertEqual(Comment.objects.count(), 30)
+        admin = User.objects.get(username='admin')
+        self.assertTrue(admin.is_superuser)
+        self.assertTrue(admin.check_password('admin'))
+
+    def test_configurable_volume(self):
+        seed(users=20, posts=120, comments_per_post=3, batch_size=50)
+        self.assertEqual(User.objects.count(), 24)
+        self.assertEqual(Post.objects.count(), 120)
+        self.assertEqual(Comment.objects.count(), 360)
+        self.assertTrue(
+            User.objects.get(username='user_0000007').check_password('admin')
+        )
+
+    def test_authors_are_adults(self):
+        seed(users=20, posts=50)
+        authors = User.objects.filter(posts__isnull=False).distinct()
+        self.assertFalse(authors.filter(is_staff=True).exists())
+        self.assertFalse(authors.filter(username='underage').exists())
+
+    def test_timestamps_are_spread(self):
+        seed(posts=50, days=10)
+        now = timezone.now()
+        dates = list(Post.objects.values_list('created_at', flat=True))
+        self.assertGreater(len(set(dates)), 1)
+        for created_at in dates:
+            self.assertLessEqual(created_at, now)
+            self.assertGreater(created_at, now - timedelta(days=11))
+        for comment in Comment.objects.select_related('post'):
+            self.assertGreaterEqual(
+                comment.created_at, comment.post.created_at
+            )
+
+    def test_seed_is_deterministic(self):
+        def snapshot():
+            return list(
+                Post.objects.order_by('id')
+                .values_list('title', 'author__username')
+            )
+
+        seed(users=10, posts=30, seed=7)
+        first = snapshot()
+        seed(users=10, posts=30, seed=7)
+        self.assertEqual(snapshot(), first)
+
+    def test_copy(self):
+        seed(users=5, posts=40, comments_per_post=2, copy=True, batch_size=15)
+        self.assertEqual(Post.objects.count(), 40)
+        self.assertEqual(Comment.objects.count(), 80)
+        post = Post.objects.order_by('id').first()
+        self.assertEqual(post.image_variants, {})
+        self.assertEqual(post.comments.count(), 2)
+
+    def test_keep(self):
+        seed(posts=5, comments_per_post=0)
+        seed(posts=5, comments_per_post=0, keep=True, users=0)
+        self.assertEqual(Post.objects.count(), 10)
+
+    def test_keep_comments_only_new_posts(self):
+        seed(posts=5, comments_per_post=1)
+        old = set(Post.objects.values_list('id', flat=True))
+        seed(posts=5, comments_per_post=2, keep=True)
+        self.assertEqual(Comment.objects.count(), 15)
+        self.assertEqual(
+            Comment.objects.filter(post_id__in=old).count(), 5
+        )
+        for post in Post.objects.exclude(id__in=old):
+            self.assertEqual(post.comment_count, 2)
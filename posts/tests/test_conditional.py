@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts.models import Post, Comment
+
+
+User = get_user_model()
+
+
+# Кеш LocMem общий для всех запросов процесса тестов
+@override_settings(POSTS_CACHE_SHARED=True)
+class ConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.user, title='Title', text='Text'
+        )
+        self.comment = Comment.objects.create(
+            author=self.user, post=self.post, text='Comment'
+        )
+
+    def test_post_list_not_modified(self):
+        url = reverse('post-list')
+        etag = self.client.get(url)['ETag']
+        # ETag из поколений кеша: ни агрегатов, ни выборки страницы
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_post_list_modified_by_new_comment(self):
+        url = reverse('post-list')
+        etag = self.client.get(url)['ETag']
+        Comment.objects.create(author=self.user, post=self.post, text='New')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_post_list_modified_by_deletion(self):
+        Post.objects.create(author=self.user, title='Second', text='Text')
+        url = reverse('post-list')
+        etag = self.client.get(url)['ETag']
+        self.post.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_depends_on_filter(self):
+        url = reverse('comment-list')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(
+            url, {'post': self.post.id}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_post_retrieve_tracks_comments(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('post-detail', args=[self.post.id])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.comment.text = 'Edited'
+        self.comment.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_comment_retrieve_last_modified(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('comment-detail', args=[self.comment.id])
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Comment.objects.filter(pk=self.comment.pk).update(
+            updated_at=timezone.now() + timedelta(minutes=1)
+        )
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_without_validators_skips_aggregates(self):
+        # Запрос без If-None-Match: страница и превью комментариев
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('post-list'))
+        self.assertIn('ETag', response)
+        # Попадание в кеш не обращается к БД
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('post-list'))
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_user_list_modified_by_new_user(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('user-list')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        User.objects.create_user(
+            username='other', password='other', birth_date='2000-01-01'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_modified_by_counters(self):
+        self.client.force_authenticate(self.user)
+        for url in (
+            reverse('user-list'), reverse('user-detail', args=[self.user.id])
+        ):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                Comment.objects.create(
+                    author=self.user, post=self.post, text='More'
+                )
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotEqual(response['ETag'], etag)
+
+    def test_user_retrieve_not_modified(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('user-detail', args=[self.user.id])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(POSTS_CACHE_SHARED=False)
+    def test_list_etag_from_content_without_shared_cache(self):
+        url = reverse('post-list')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        # Поколения других воркеров неизвестны: ETag следует за данными,
+        # даже если запись не сбросила поколение этого процесса
+        Post.objects.filter(pk=self.post.pk).update(title='Changed')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,177 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts import counters
+from posts.models import Comment, Post
+
+
+User = get_user_model()
+
+
+class CountersTestCase(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username='author', password='author', birth_date='1990-01-01'
+        )
+        self.reader = User.objects.create_user(
+            username='reader', password='reader', birth_date='1990-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.author, title='Пост', text='Текст'
+        )
+
+    def assertCounts(self, post_comments, author, reader):
+        self.post.refresh_from_db()
+        self.author.refresh_from_db()
+        self.reader.refresh_from_db()
+        self.assertEqual(self.post.comment_count, post_comments)
+        self.assertEqual(
+            (self.author.post_count, self.author.comment_count), author
+        )
+        self.assertEqual(
+            (self.reader.post_count, self.reader.comment_count), reader
+        )
+
+    def test_create_through_api(self):
+        self.client.login(username='reader', password='reader')
+        response = self.client.post(
+            reverse('comment-list'), {'post': self.post.pk, 'text': 'Да'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(
+            reverse('post-list'), {'title': 'Второй', 'text': 'Текст'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertCounts(1, author=(1, 0), reader=(1, 1))
+
+        response = self.client.get(reverse('post-detail', args=[self.post.pk]))
+        self.assertEqual(response.data['comment_count'], 1)
+        response = self.client.get(
+            reverse('user-detail', args=[self.reader.pk])
+        )
+        self.assertEqual(response.data['post_count'], 1)
+        self.assertEqual(response.data['comment_count'], 1)
+
+    def test_bulk_create(self):
+        self.client.login(username='reader', password='reader')
+        data = [{'post': self.post.pk, 'text': f'№{i}'} for i in range(3)]
+        response = self.client.post(
+            reverse('comment-bulk-create'), data, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertCounts(3, author=(1, 0), reader=(0, 3))
+
+    def test_delete_and_cascade(self):
+        comments = [
+            Comment.objects.create(
+                author=self.reader, post=self.post, text=f'№{i}'
+            )
+            for i in range(3)
+        ]
+        comments[0].delete()
+        self.assertCounts(2, author=(1, 0), reader=(0, 2))
+        self.post.delete()
+        self.author.refresh_from_db()
+        self.reader.refresh_from_db()
+        self.assertEqual(self.author.post_count, 0)
+        self.assertEqual(self.reader.comment_count, 0)
+
+    def test_cascade_updates_counters_once_per_amount(self):
+        other = User.objects.create_user(
+            username='other', password='other', birth_date='1990-01-01'
+        )
+        other_post = Post.objects.create(
+            author=other, title='Другой', text='Текст'
+        )
+        for author, count in ((self.reader, 3), (other, 2), (self.author, 1)):
+            for i in range(count):
+                Comment.objects.create(
+                    author=author, post=self.post, text=f'№{i}'
+                )
+        Comment.objects.create(
+            author=self.author, post=other_post, text='Чужой пост'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.post.delete()
+        updates = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        # Три автора с разным числом комментариев и post_count автора;
+        # удаляемый пост не обновляется
+        self.assertEqual(len(updates), 4)
+        self.assertFalse(any('posts_post' in sql for sql in updates))
+        self.author.refresh_from_db()
+        self.reader.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(
+            (self.author.post_count, self.author.comment_count), (0, 1)
+        )
+        self.assertEqual(self.reader.comment_count, 0)
+        self.assertEqual(other.comment_count, 0)
+
+        # Удаление пользователя: его посты и комментарии уходят каскадом,
+        # обновляются только счётчики оставшихся строк
+        Comment.objects.create(
+            author=self.reader, post=other_post, text='Ещё'
+        )
+        self.author.delete()
+        other_post.refresh_from_db()
+        self.reader.refresh_from_db()
+        self.assertEqual(other_post.comment_count, 1)
+        self.assertEqual(self.reader.comment_count, 1)
+        self.assertEqual(counters.reconcile(dry_run=True), {
+            'post.comment_count': 0,
+            'user.comment_count': 0,
+            'user.post_count': 0,
+        })
+
+    def test_move_comment_to_other_post(self):
+        other = Post.objects.create(
+            author=self.author, title='Другой', text='Текст'
+        )
+        comment = Comment.objects.create(
+            author=self.reader, post=self.post, text='Текст'
+        )
+        self.client.login(username='reader', password='reader')
+        response = self.client.patch(
+            reverse('comment-detail', args=[comment.pk]), {'post': other.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        other.refresh_from_db()
+        self.assertEqual(other.comment_count, 1)
+        self.assertCounts(0, author=(2, 0), reader=(0, 1))
+
+    def test_save_does_not_overwrite_counters(self):
+        # Экземпляр прочитан до появления комментария
+        stale = Post.objects.get(pk=self.post.pk)
+        stale_user = User.objects.get(pk=self.reader.pk)
+        Comment.objects.create(author=self.reader, post=self.post, text='!')
+        stale.title = 'Новый заголовок'
+        stale.save()
+        stale_user.phone = '123'
+        stale_user.save()
+        self.assertCounts(1, author=(1, 0), reader=(0, 1))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, 'Новый заголовок')
+
+    def test_reconcile(self):
+        Comment.objects.create(author=self.reader, post=self.post, text='!')
+        Post.objects.update(comment_count=10)
+        User.objects.update(post_count=0, comment_count=5)
+        out = StringIO()
+        call_command('reconcile_counters', '--dry-run', stdout=out)
+        self.assertIn('post.comment_count: 1', out.getvalue())
+        self.assertCounts(10, author=(0, 5), reader=(0, 5))
+
+        out = StringIO()
+        call_command('reconcile_counters', stdout=out)
+        self.assertIn('user.comment_count: 2', out.getvalue())
+        self.assertCounts(1, author=(1, 0), reader=(0, 1))
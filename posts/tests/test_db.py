@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+
+from posts.db.base import DatabaseWrapper
+
+
+class HealthChecksTestCase(TestCase):
+    def make_connection(self, health_checks=True):
+        # Отдельное соединение к тестовой БД, вне обработчика connections
+        conn = DatabaseWrapper(
+            {**connection.settings_dict, 'CONN_HEALTH_CHECKS': health_checks},
+            alias=connection.alias
+        )
+        self.addCleanup(conn.close)
+        return conn
+
+    def query(self, conn):
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+    def test_checks_once_on_first_use(self):
+        conn = self.make_connection()
+        with mock.patch.object(
+            conn, 'is_usable', wraps=conn.is_usable
+        ) as is_usable:
+            # Только что открытое соединение не проверяется
+            self.query(conn)
+            self.query(conn)
+            # Начало запроса: проверки ещё нет
+            conn.close_if_unusable_or_obsolete()
+            is_usable.assert_not_called()
+            self.query(conn)
+            self.query(conn)
+            is_usable.assert_called_once_with()
+
+    def test_broken_connection_is_replaced(self):
+        conn = self.make_connection()
+        self.query(conn)
+        broken = conn.connection
+        conn.close_if_unusable_or_obsolete()
+        with mock.patch.object(conn, 'is_usable', return_value=False):
+            self.query(conn)
+        self.assertIsNot(conn.connection, broken)
+
+    def test_skips_without_health_checks(self):
+        conn = self.make_connection(health_checks=False)
+        self.query(conn)
+        conn.close_if_unusable_or_obsolete()
+        with mock.patch.object(conn, 'is_usable') as is_usable:
+            self.query(conn)
+        is_usable.assert_not_called()
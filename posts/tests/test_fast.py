@@ -0,0 +1,145 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+
+from posts.constants import LATEST_COMMENTS_LIMIT
+from posts.fast import ReadPlan, UnsupportedField
+from posts.models import Comment, Post
+from posts.serializers import PostSerializer, UserSerializer
+
+
+User = get_user_model()
+
+
+class FastReadTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.other = User.objects.create_user(
+            username='other', password='other', birth_date='2000-01-01'
+        )
+        self.posts = [
+            Post.objects.create(
+                author=self.user, title=f'Пост {i}',
+                text='Длинный текст про котов ' * 20
+            )
+            for i in range(3)
+        ]
+        image = 'post_images/photo.png'
+        Post.objects.filter(pk=self.posts[0].pk).update(
+            image=image, image_variants={
+                'source': image,
+                'files': {'small': 'post_images/variants/photo_small.webp'},
+            }
+        )
+        # Варианты от прежнего изображения в ответ не попадают
+        Post.objects.filter(pk=self.posts[1].pk).update(
+            image='post_images/new.png',
+            image_variants={'source': image, 'files': {'small': 'old.webp'}}
+        )
+        for i in range(LATEST_COMMENTS_LIMIT + 2):
+            Comment.objects.create(
+                author=self.other, post=self.posts[0], text=f'Кот №{i}'
+            )
+        Comment.objects.create(
+            author=self.user, post=self.posts[2], text='Без котов'
+        )
+
+    def get_both(self, url, params):
+        '''Ответы быстрого и обычного пути; тела должны совпадать побайтно'''
+        cache.clear()
+        fast = self.client.get(url, params)
+        cache.clear()
+        with override_settings(POSTS_FAST_READ=False):
+            slow = self.client.get(url, params)
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast.content, slow.content)
+        return fast
+
+    def test_post_list_matches_serializer(self):
+        cases = [
+            {},
+            {'fields': 'id,title,image,image_variants'},
+            {'omit': 'text,latest_comments'},
+            {'fields': 'id,text_preview,comment_count'},
+            {'search': 'коты'},
+            {'search': 'коты', 'fields': 'title'},
+            {'page_size': 2},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                self.get_both(reverse('post-list'), params)
+
+        with override_settings(TIME_ZONE='Europe/Moscow'):
+            self.get_both(reverse('post-list'), {})
+        self.client.login(username='user', password='user')
+        self.get_both(reverse('post-list'), {})
+
+    def test_comment_lists_match_serializer(self):
+        cases = [
+            (reverse('comment-list'), {}),
+            (reverse('comment-list'), {'post': self.posts[0].pk}),
+            (reverse('comment-list'), {'fields': 'id,post', 'search': 'кот'}),
+            (reverse('post-comments', args=[self.posts[0].pk]), {}),
+            (
+                reverse('post-comments', args=[self.posts[0].pk]),
+                {'omit': 'text', 'page_size': 3}
+            ),
+        ]
+        for url, params in cases:
+            with self.subTest(url=url, params=params):
+                self.get_both(url, params)
+
+    def test_cursor_pages(self):
+        response = self.get_both(reverse('post-list'), {'page_size': 1})
+        while response.data['next']:
+            response = self.get_both(response.data['next'], {})
+        self.assertEqual(response.data['results'][0]['id'], self.posts[0].pk)
+        previous = self.get_both(response.data['previous'], {})
+        self.assertEqual(previous.data['results'][0]['id'], self.posts[1].pk)
+
+    def test_list_skips_model_serializer(self):
+        with mock.patch.object(
+            serializers.Serializer, 'to_representation',
+            side_effect=AssertionError
+        ), self.assertNumQueries(2):
+            # Страница и превью комментариев
+            response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        post = response.data['results'][-1]
+        self.assertEqual(len(post['latest_comments']), LATEST_COMMENTS_LIMIT)
+        self.assertEqual(
+            post['image_variants'],
+            {'small': 'http://testserver'
+                      '/media/post_images/variants/photo_small.webp'}
+        )
+
+    def test_unsupported_field_falls_back(self):
+        # DateField план не читает
+        with self.assertRaises(UnsupportedField):
+            ReadPlan(UserSerializer())
+        with mock.patch.object(
+            PostSerializer, 'read_text_preview', side_effect=UnsupportedField
+        ), mock.patch.object(
+            serializers.Serializer, 'to_representation',
+            autospec=True, side_effect=serializers.Serializer.to_representation
+        ) as to_representation:
+            self.get_both(reverse('post-list'), {'fields': 'text_preview'})
+        self.assertTrue(to_representation.called)
+
+    def test_overridden_to_representation_falls_back(self):
+        class UpperTitleSerializer(PostSerializer):
+            def to_representation(self, post):
+                data = super().to_representation(post)
+                data['title'] = data['title'].upper()
+                return data
+
+        with self.assertRaises(UnsupportedField):
+            ReadPlan(UpperTitleSerializer())
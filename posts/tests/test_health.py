@@ -0,0 +1,32 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase
+from django.urls import reverse
+
+
+class HealthTestCase(TestCase):
+    def test_liveness(self):
+        response = self.client.get(reverse('health_live'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_readiness(self):
+        response = self.client.get(reverse('health_ready'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['checks'], {'database': 'ok', 'cache': 'ok'}
+        )
+
+    def test_readiness_fails_without_database(self):
+        error = OperationalError('connection to "db-primary" user "posts"')
+        with mock.patch(
+            'config.health.connection.cursor', side_effect=error
+        ), self.assertLogs('config.health', 'ERROR') as logs:
+            response = self.client.get(reverse('health_ready'))
+        self.assertEqual(response.status_code, 503)
+        # Текст ошибки — только в логе, не в ответе анонимному клиенту
+        self.assertEqual(
+            response.json()['checks']['database'], 'unavailable'
+        )
+        self.assertNotIn('db-primary', response.content.decode())
+        self.assertIn('db-primary', '\n'.join(logs.output))
@@ -0,0 +1,164 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts.images import process_post_image, run_pending_tasks
+from posts.models import ImageTask, Post
+
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_file(size=(2000, 1500), name='photo.png', image_format='PNG',
+               color=(200, 100, 50, 255)):
+    file = BytesIO()
+    Image.new('RGBA', size, color).save(file, image_format)
+    return SimpleUploadedFile(
+        name, file.getvalue(), content_type=f'image/{image_format.lower()}'
+    )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageVariantsTestCase(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.client.login(username='user', password='user')
+
+    def upload(self, file):
+        response = self.client.post(
+            reverse('post-list'),
+            {'title': 'Photo', 'text': 'Text', 'image': file},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response
+
+    def test_upload_queues_task(self):
+        response = self.upload(image_file())
+        self.assertEqual(response.data['image_variants'], {})
+        post_id = response.data['id']
+        self.assertTrue(ImageTask.objects.filter(post_id=post_id).exists())
+
+        call_command('process_images', once=True, stdout=StringIO())
+        self.assertFalse(ImageTask.objects.exists())
+        response = self.client.get(reverse('post-detail', args=[post_id]))
+        variants = response.data['image_variants']
+        self.assertEqual(set(variants), {'thumbnail', 'web'})
+        self.assertTrue(variants['web'].startswith('http://testserver/media/'))
+
+        post = Post.objects.get(pk=post_id)
+        with post.image.storage.open(
+            post.image_variants['files']['thumbnail']
+        ) as file:
+            content = file.read()
+        thumbnail = Image.open(BytesIO(content))
+        self.assertEqual(thumbnail.format, 'WEBP')
+        self.assertEqual(thumbnail.size, (320, 240))
+        # Имя начинается с хеша байтов варианта, а не оригинала
+        name = os.path.basename(post.image_variants['files']['thumbnail'])
+        self.assertTrue(name.startswith(hashlib.sha256(content).hexdigest()))
+
+    @override_settings(
+        POSTS_IMAGE_QUEUE='immediate', POSTS_IMAGE_FORMAT='JPEG'
+    )
+    def test_immediate_queue(self):
+        response = self.upload(image_file(size=(100, 80)))
+        post = Post.objects.get(pk=response.data['id'])
+        files = post.image_variants['files']
+        self.assertTrue(files['web'].endswith('.jpg'))
+        with post.image.storage.open(files['web']) as file:
+            # Меньше варианта — не увеличивается
+            self.assertEqual(Image.open(file).size, (100, 80))
+
+    def test_replaced_image_is_reprocessed(self):
+        response = self.upload(image_file())
+        post_id = response.data['id']
+        process_post_image(post_id)
+        old = Post.objects.get(pk=post_id).image_variants
+
+        self.client.patch(
+            reverse('post-detail', args=[post_id]),
+            {'image': image_file(color=(0, 0, 0, 255))}, format='multipart'
+        )
+        post = Post.objects.get(pk=post_id)
+        self.assertEqual(post.image_variants, old)
+        response = self.client.get(reverse('post-detail', args=[post_id]))
+        self.assertEqual(response.data['image_variants'], {})
+
+        process_post_image(post_id)
+        post.refresh_from_db()
+        self.assertEqual(post.image_variants['source'], post.image.name)
+        self.assertFalse(
+            post.image.storage.exists(old['files']['thumbnail'])
+        )
+
+    def upload_broken(self):
+        file = image_file()
+        # Заголовок PNG цел, данные повреждены: ошибку найдёт воркер
+        file = SimpleUploadedFile(
+            'broken.png', file.read()[:200], content_type='image/png'
+        )
+        return self.upload(file)
+
+    @override_settings(POSTS_IMAGE_RETRY_DELAY=0)
+    def test_broken_image_fails_after_retries(self):
+        response = self.upload_broken()
+        call_command('process_images', once=True, stdout=StringIO())
+        task = ImageTask.objects.get(post_id=response.data['id'])
+        self.assertEqual(task.status, ImageTask.FAILED)
+        self.assertEqual(task.attempts, 3)
+
+    @override_settings(POSTS_IMAGE_RETRY_DELAY=60)
+    def test_failed_task_retried_after_backoff(self):
+        response = self.upload_broken()
+        self.assertEqual(run_pending_tasks(), 1)
+        # Повтор отложен: воркер не берёт задачу сразу
+        self.assertEqual(run_pending_tasks(), 0)
+        task = ImageTask.objects.get(post_id=response.data['id'])
+        self.assertEqual(task.attempts, 1)
+        self.assertGreater(
+            task.run_after, timezone.now() + timedelta(seconds=59)
+        )
+
+        ImageTask.objects.update(run_after=timezone.now())
+        self.assertEqual(run_pending_tasks(), 1)
+        task.refresh_from_db()
+        self.assertEqual(task.attempts, 2)
+        # Вторая пауза вдвое длиннее первой
+        self.assertGreater(
+            task.run_after, timezone.now() + timedelta(seconds=119)
+        )
+
+    def test_rejects_non_image(self):
+        response = self.client.post(
+            reverse('post-list'),
+            {
+                'title': 'Photo', 'text': 'Text',
+                'image': SimpleUploadedFile('photo.png', b'not an image'),
+            },
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('image', response.data)
@@ -0,0 +1,79 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, override_settings
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+HASHED = 'post_images/' + 'a' * 64 + '.png'
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ServeMediaTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        default_storage.save(HASHED, ContentFile(b'png bytes'))
+        default_storage.save('post_images/legacy.jpg', ContentFile(b'jpg'))
+        default_storage.save('private/secret.txt', ContentFile(b'secret'))
+        default_storage.save(
+            'post_images/variants/thumb.webp', ContentFile(b'webp')
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_file_response_fallback(self):
+        response = self.client.get(f'/media/{HASHED}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'png bytes')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(
+            response['Cache-Control'], 'public, max-age=31536000, immutable'
+        )
+
+    def test_not_hashed_name_short_cache(self):
+        response = self.client.get('/media/post_images/legacy.jpg')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+
+    def test_not_modified(self):
+        last_modified = self.client.get(f'/media/{HASHED}')['Last-Modified']
+        response = self.client.get(
+            f'/media/{HASHED}', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(POSTS_MEDIA_ACCEL='nginx')
+    def test_x_accel_redirect(self):
+        response = self.client.get(f'/media/{HASHED}')
+        self.assertEqual(
+            response['X-Accel-Redirect'], f'/protected-media/{HASHED}'
+        )
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response.content, b'')
+
+    @override_settings(POSTS_MEDIA_ACCEL='sendfile')
+    def test_x_sendfile(self):
+        response = self.client.get(f'/media/{HASHED}')
+        self.assertEqual(response['X-Sendfile'], default_storage.path(HASHED))
+
+    def test_forbidden_paths(self):
+        for path in (
+            'private/secret.txt',
+            'post_images/../private/secret.txt',
+            'post_images/missing.png',
+            'post_images/',
+            'post_images/variants/',
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(f'/media/{path}')
+                self.assertEqual(response.status_code, 404)
+
+    def test_only_safe_methods(self):
+        response = self.client.post(f'/media/{HASHED}')
+        self.assertEqual(response.status_code, 405)
@@ -1,5 +1,7 @@
 from django.test import TestCase
-from posts.models import User, Post, Comment
+from django.urls import reverse
+from posts.models import (User, Post, Comment, AllowedEmailDomain,
+                          BannedTitleWord)
 
 
 class ModelStrTest(TestCase):
@@ -30,3 +32,35 @@ class ModelStrTest(TestCase):
     def test_comment_str(self):
         expected = f'Комментарий {self.user} к посту "{self.post}"'
         self.assertEqual(str(self.comment), expected)
+
+
+class ModerationListsAdminTest(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(
+            username='admin', password='admin', birth_date='1990-01-01'
+        )
+        self.client.force_login(admin)
+
+    def test_duplicate_in_other_case_is_form_error(self):
+        cases = [
+            (BannedTitleWord, 'word', 'ерунда', 'ЕРУНДА'),
+            (AllowedEmailDomain, 'domain', 'mail.ru', ' Mail.RU '),
+        ]
+        for model, field, existing, value in cases:
+            with self.subTest(model=model.__name__):
+                url = reverse(
+                    f'admin:posts_{model._meta.model_name}_add'
+                )
+                response = self.client.post(url, {field: value})
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.context['adminform'].form.errors)
+                self.assertEqual(
+                    model.objects.filter(**{f'{field}__iexact': existing})
+                    .count(), 1
+                )
+
+    def test_value_is_saved_lowercase(self):
+        url = reverse('admin:posts_bannedtitleword_add')
+        response = self.client.post(url, {'word': ' Белиберда '})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(BannedTitleWord.objects.filter(word='белиберда'))
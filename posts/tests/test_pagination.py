@@ -0,0 +1,121 @@
+from base64 import b64encode
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts.models import Post, Comment
+
+
+User = get_user_model()
+
+
+class KeysetPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.posts = [
+            Post.objects.create(
+                author=self.user, title=f'Post {i}', text='Text'
+            )
+            for i in range(7)
+        ]
+        # Одинаковое время создания: порядок задаёт только id
+        Post.objects.filter(pk__in=[p.pk for p in self.posts[2:5]]).update(
+            created_at=datetime(2024, 1, 1, 12, 0, 0, 123456, timezone.utc)
+        )
+
+    def collect_pages(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_list_is_paginated(self):
+        response = self.client.get(reverse('post-list'), {'page_size': 3})
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_walk_all_pages_without_gaps_and_duplicates(self):
+        url = reverse('post-list') + '?page_size=2'
+        ids = self.collect_pages(url)
+        expected = list(
+            Post.objects.order_by('-created_at', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        url = reverse('post-list') + '?page_size=2'
+        first = self.client.get(url).data
+        second = self.client.get(first['next']).data
+        third = self.client.get(second['next']).data
+        back = self.client.get(third['previous']).data
+        self.assertEqual(back['results'], second['results'])
+        self.assertIsNotNone(back['previous'])
+
+    def page_query(self, url):
+        '''SQL запроса страницы (выборка постов по курсору)'''
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        return next(
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "posts_post" WHERE ROW(' in query['sql']
+        )
+
+    def test_cursor_is_row_comparison_in_index(self):
+        first = self.client.get(reverse('post-list'), {'page_size': 2}).data
+        sql = self.page_query(first['next'])
+        self.assertIn(
+            'ROW("posts_post"."created_at", "posts_post"."id") < ROW(', sql
+        )
+        with connection.cursor() as cursor:
+            # В маленькой таблице планировщик иначе выберет Seq Scan
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('Index Cond: (ROW(created_at, id) < ROW(', plan)
+
+    def test_previous_cursor_compares_greater(self):
+        first = self.client.get(reverse('post-list'), {'page_size': 2}).data
+        second = self.client.get(first['next']).data
+        sql = self.page_query(second['previous'])
+        self.assertIn('"posts_post"."id") > ROW(', sql)
+
+    def test_max_page_size(self):
+        response = self.client.get(reverse('post-list'), {'page_size': 10000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_invalid_cursor(self):
+        positions = (
+            'not json', '["2024-01-01T00:00:00+00:00", 1]', '{"id": 1}',
+            '{"created_at": "bad date", "id": 1}',
+            '{"created_at": null, "id": "x"}',
+        )
+        cursors = ['garbage'] + [
+            b64encode(urlencode({'p': p}).encode()).decode()
+            for p in positions
+        ]
+        url = reverse('post-list')
+        for cursor in cursors:
+            response = self.client.get(url, {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comments_are_paginated(self):
+        for i in range(3):
+            Comment.objects.create(
+                author=self.user, post=self.posts[0], text=f'Comment {i}'
+            )
+        url = reverse('comment-list') + '?page_size=2'
+        self.assertEqual(len(self.collect_pages(url)), 3)
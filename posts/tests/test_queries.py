@@ -0,0 +1,89 @@
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from posts.models import Post, Comment
+from posts.testing import QueryCountMixin
+
+
+User = get_user_model()
+
+
+class ListQueryCountTestCase(QueryCountMixin, APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', password='admin', birth_date='1990-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.admin, title='Title', text='Text'
+        )
+        self.counter = 0
+
+    def new_user(self):
+        self.counter += 1
+        return User.objects.create_user(
+            username=f'user{self.counter}', password='user',
+            birth_date='2000-01-01'
+        )
+
+    def add_posts(self, n):
+        for _ in range(n):
+            Post.objects.create(
+                author=self.new_user(), title='Title', text='Text'
+            )
+
+    def add_comments(self, n):
+        for _ in range(n):
+            post = Post.objects.create(
+                author=self.new_user(), title='Title', text='Text'
+            )
+            Comment.objects.create(
+                author=self.new_user(), post=post, text='Comment'
+            )
+
+    def test_post_list(self):
+        # Страница постов и одна предвыборка последних комментариев
+        self.assertConstantQueries(
+            reverse('post-list'), self.add_posts, num=2
+        )
+
+    def test_post_list_with_comments(self):
+        self.assertConstantQueries(
+            reverse('post-list'), self.add_comments, num=2
+        )
+
+    def test_comment_list(self):
+        self.assertConstantQueries(
+            reverse('comment-list'), self.add_comments, num=1
+        )
+
+    def test_post_comments_route(self):
+        def add_comments(n):
+            for _ in range(n):
+                Comment.objects.create(
+                    author=self.new_user(), post=self.post, text='Comment'
+                )
+
+        # Проверка существования поста и страница комментариев
+        self.assertConstantQueries(
+            reverse('post-comments', args=[self.post.id]), add_comments, num=2
+        )
+
+    def test_comment_list_browsable_api(self):
+        self.client.force_login(self.new_user())
+        self.assertConstantQueries(
+            reverse('comment-list'), self.add_comments,
+            HTTP_ACCEPT='text/html'
+        )
+
+    def test_admin_post_changelist(self):
+        self.client.force_login(self.admin)
+        self.assertConstantQueries(
+            reverse('admin:posts_post_changelist'), self.add_posts
+        )
+
+    def test_admin_comment_changelist(self):
+        self.client.force_login(self.admin)
+        self.assertConstantQueries(
+            reverse('admin:posts_comment_changelist'), self.add_comments
+        )
@@ -0,0 +1,101 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from posts.models import Post
+from posts.parsers import FastJSONParser
+from posts.renderers import FastJSONRenderer
+
+
+User = get_user_model()
+
+DATA = {
+    'utc': datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc),
+    'moscow': datetime(2024, 7, 1, 12, 0, tzinfo=ZoneInfo('Europe/Moscow')),
+    'date': date(2024, 1, 2),
+    'price': Decimal('10.50'),
+    'message': gettext_lazy('Это поле обязательно.'),
+    'uuid': uuid.UUID(int=1),
+    'items': [{'id': 1, 'text': 'строка\u2028абзац\u2029'}, None, True],
+    1: 'ключ-число',
+}
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    def assertSameAsDRF(self, data, media_type=None, context=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type, context),
+            JSONRenderer().render(data, media_type, context)
+        )
+
+    def test_matches_json_renderer(self):
+        self.assertSameAsDRF(DATA)
+        self.assertSameAsDRF(None)
+        # Отступ (в том числе в browsable API) — через стандартный json
+        self.assertSameAsDRF(DATA, 'application/json; indent=2')
+        self.assertSameAsDRF(DATA, context={'indent': 4})
+
+    def test_fallbacks(self):
+        # Целые больше 64 бит orjson не пишет
+        self.assertSameAsDRF({'big': 2 ** 70})
+        with mock.patch('posts.renderers.orjson', None):
+            self.assertSameAsDRF(DATA)
+        # Порядок у float orjson пишет иначе
+        self.assertSameAsDRF({'floats': [0.5, -0.0, 1e16, (1e-7, 2.5e-5)]})
+        # Decimal кодировщик DRF превращает во float
+        self.assertSameAsDRF({'price': Decimal('1E+20')})
+
+    def test_non_finite_float_is_error(self):
+        for value in (float('nan'), float('inf')):
+            with self.subTest(value=value):
+                for renderer in (FastJSONRenderer(), JSONRenderer()):
+                    with self.assertRaises(ValueError):
+                        renderer.render({'items': [{'value': value}]})
+
+    def test_parser(self):
+        body = JSONRenderer().render({'items': [{'text': 'Текст'}] * 3})
+        parsed = FastJSONParser().parse(BytesIO(body))
+        self.assertEqual(parsed, JSONParser().parse(BytesIO(body)))
+        big = BytesIO(b'{"big": 1180591620717411303424}')
+        self.assertEqual(FastJSONParser().parse(big), {'big': 2 ** 70})
+        with mock.patch('posts.parsers.orjson', None):
+            self.assertEqual(FastJSONParser().parse(BytesIO(body)), parsed)
+
+        for parser in (FastJSONParser(), JSONParser()):
+            with self.assertRaises(ParseError) as error:
+                parser.parse(BytesIO(b'{"text": NaN}'))
+            self.assertIn('JSON parse error', str(error.exception))
+
+
+class FastJSONApiTestCase(APITestCase):
+    def test_api_uses_fast_renderer_and_parser(self):
+        user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        Post.objects.create(author=user, title='Пост', text='Текст')
+        self.client.login(username='user', password='user')
+        response = self.client.post(
+            reverse('post-list'), {'title': 'Новый', 'text': 'Текст'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get(reverse('post-list'))
+        self.assertIsInstance(
+            response.accepted_renderer, FastJSONRenderer
+        )
+        self.assertEqual(
+            response.content, JSONRenderer().render(response.data)
+        )
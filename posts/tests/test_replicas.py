@@ -0,0 +1,141 @@
+from unittest import mock, skipUnless
+
+import pytest
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from posts.models import Post
+from posts.replicas import (PRIMARY_PIN_COOKIE, PrimaryReplicaRouter,
+                            _read_from_replica, reading_from_replica)
+
+
+User = get_user_model()
+
+
+@pytest.mark.replica
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.token = _read_from_replica.set(False)
+
+    def tearDown(self):
+        _read_from_replica.reset(self.token)
+
+    def test_reads_from_primary_outside_requests(self):
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_reads_from_replica(self):
+        _read_from_replica.set(True)
+        self.assertEqual(self.router.db_for_read(Post), 'replica')
+
+    def test_write_pins_primary(self):
+        _read_from_replica.set(True)
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        _read_from_replica.set(True)
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_migrates_only_primary(self):
+        self.assertTrue(self.router.allow_migrate('default', 'posts'))
+        self.assertFalse(self.router.allow_migrate('replica', 'posts'))
+
+
+class ReplicaReadMixinTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.user, title='Title', text='Text'
+        )
+        self.client.force_authenticate(self.user)
+
+    def routed_reads(self, method, url, data=None):
+        '''Запрос и список: читал ли роутер из реплики при каждом чтении'''
+        reads = []
+
+        def db_for_read(router, model, **hints):
+            reads.append(reading_from_replica())
+            return 'default'
+
+        with mock.patch.object(
+            PrimaryReplicaRouter, 'db_for_read', db_for_read
+        ):
+            response = getattr(self.client, method)(url, data, format='json')
+        return response, reads
+
+    def test_safe_request_reads_from_replica(self):
+        response, reads = self.routed_reads('get', reverse('post-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(reads)
+        self.assertTrue(all(reads))
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+        self.assertFalse(reading_from_replica())
+
+    def test_write_reads_from_primary_and_pins(self):
+        url = reverse('post-detail', args=[self.post.id])
+        response, reads = self.routed_reads('patch', url, {'text': 'New'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(reads))
+        cookie = response.cookies[PRIMARY_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.POSTS_PRIMARY_PIN_SECONDS)
+
+        # Следующее чтение клиента видит свою запись
+        response, reads = self.routed_reads('get', url)
+        self.assertEqual(response.json()['text'], 'New')
+        self.assertFalse(any(reads))
+
+    @override_settings(POSTS_CACHE_SHARED=True, DATABASE_REPLICAS=['replica'])
+    def test_cached_page_is_built_from_primary(self):
+        # Реплика может отставать от записи, сменившей поколение кеша
+        cache.clear()
+        self.client.force_authenticate(None)
+        response, reads = self.routed_reads('get', reverse('post-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertTrue(reads)
+        self.assertFalse(any(reads))
+
+    @override_settings(POSTS_CACHE_SHARED=True, DATABASE_REPLICAS=['replica'])
+    def test_replica_page_gets_content_etag(self):
+        url = reverse('post-list')
+        response, reads = self.routed_reads('get', url)
+        self.assertTrue(all(reads))
+        # Реплика догнала запись: ETag по поколению не изменился бы
+        Post.objects.filter(pk=self.post.pk).update(title='Changed')
+        changed, _ = self.routed_reads('get', url)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+
+    def test_failed_write_does_not_pin(self):
+        url = reverse('post-detail', args=[self.post.id])
+        response, _ = self.routed_reads('patch', url, {'title': ''})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+
+# Данные фиксируются, чтобы их было видно через соединение реплики
+@pytest.mark.replica
+@skipUnless('replica' in settings.DATABASES, 'Реплика не настроена')
+class ReplicaDatabaseTestCase(APITransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def test_list_queries_replica(self):
+        user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        Post.objects.create(author=user, title='Title', text='Text')
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(reverse('post-list'))
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertTrue(replica.captured_queries)
@@ -0,0 +1,152 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts.models import Comment, Post
+
+
+User = get_user_model()
+
+
+class FullTextSearchTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.title_match = Post.objects.create(
+            author=self.user, title='Кошки и собаки',
+            text='Про домашних животных'
+        )
+        self.text_match = Post.objects.create(
+            author=self.user, title='Заметки',
+            text='Вчера видел кошку во дворе'
+        )
+        self.other = Post.objects.create(
+            author=self.user, title='Погода', text='Завтра обещают дождь'
+        )
+
+    def search(self, url, query, **params):
+        response = self.client.get(url, {'search': query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+
+    def test_vector_is_maintained_by_trigger(self):
+        post = Post.objects.get(pk=self.other.pk)
+        self.assertIn('дожд', post.search_vector)
+        Post.objects.filter(pk=post.pk).update(text='Солнечно')
+        post.refresh_from_db()
+        self.assertNotIn('дожд', post.search_vector)
+        self.assertIn('солнечн', post.search_vector)
+
+    def test_russian_stemming_and_rank(self):
+        # «кошками» находит «Кошки» и «кошку»; совпадение в заголовке
+        # весит больше, чем в тексте
+        ids = self.search(reverse('post-list'), 'кошками')
+        self.assertEqual(ids, [self.title_match.pk, self.text_match.pk])
+
+    def test_websearch_syntax(self):
+        ids = self.search(reverse('post-list'), 'кошки -собаки')
+        self.assertEqual(ids, [self.text_match.pk])
+
+    @override_settings(POSTS_SEARCH_RANK_LIMIT=1)
+    def test_common_word_ordered_by_date(self):
+        # Совпадений больше лимита: релевантность не считается
+        url = reverse('post-list')
+        ids = self.search(url, 'кошками')
+        self.assertEqual(ids, [self.text_match.pk, self.title_match.pk])
+        self.assertEqual(
+            self.search(url, 'кошки -собаки'), [self.text_match.pk]
+        )
+
+    def walk_after_first_page(self, url, query, change):
+        '''Листает выдачу по одной записи, меняя данные после 1-й страницы'''
+        response = self.client.get(url, {'search': query, 'page_size': 1})
+        ids = [item['id'] for item in response.data['results']]
+        change()
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item['id'] for item in response.data['results'])
+        return ids
+
+    def test_cursor_keeps_rank_above_limit(self):
+        url = reverse('post-list')
+
+        def add_matches():
+            for i in range(2):
+                Post.objects.create(
+                    author=self.user, title=f'Новость {i}', text='кошка'
+                )
+
+        with override_settings(POSTS_SEARCH_RANK_LIMIT=2):
+            ids = self.walk_after_first_page(url, 'кошками', add_matches)
+        self.assertEqual(ids, self.search(url, 'кошками', page_size=100))
+        self.assertEqual(ids[0], self.title_match.pk)
+        self.assertEqual(len(ids), 4)
+
+    @override_settings(POSTS_SEARCH_RANK_LIMIT=1)
+    def test_cursor_keeps_date_order_below_limit(self):
+        newest = self.text_match.pk
+        ids = self.walk_after_first_page(
+            reverse('post-list'), 'кошками', self.text_match.delete
+        )
+        self.assertEqual(ids, [newest, self.title_match.pk])
+
+    def test_no_match(self):
+        self.assertEqual(self.search(reverse('post-list'), 'самолёт'), [])
+
+    def test_vector_is_not_in_response(self):
+        response = self.client.get(
+            reverse('post-detail', args=[self.other.pk])
+        )
+        self.assertNotIn('search_vector', response.data)
+
+    def test_updated_post_is_found(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.patch(
+            reverse('post-detail', args=[self.other.pk]),
+            {'text': 'Кошка спит на солнце'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = self.search(reverse('post-list'), 'кошка')
+        self.assertIn(self.other.pk, ids)
+
+    def test_pages_follow_rank(self):
+        for i in range(5):
+            Post.objects.create(
+                author=self.user, title=f'Новость {i}',
+                text='кошка ' * (i + 1)
+            )
+        url = reverse('post-list')
+        expected = self.search(url, 'кошка', page_size=100)
+        ids = []
+        response = self.client.get(url, {'search': 'кошка', 'page_size': 2})
+        while True:
+            ids.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(ids), 7)
+
+    def test_search_comments(self):
+        comment = Comment.objects.create(
+            author=self.user, post=self.other, text='Отличные фотографии'
+        )
+        other = Comment.objects.create(
+            author=self.user, post=self.title_match,
+            text='Фотографии не открываются'
+        )
+        url = reverse('comment-list')
+        self.assertEqual(
+            sorted(self.search(url, 'фотография')), [comment.pk, other.pk]
+        )
+        self.assertEqual(
+            self.search(url, 'фотография', post=self.other.pk), [comment.pk]
+        )
+        self.assertEqual(self.search(url, 'фотография -отличные'), [other.pk])
+        url = reverse('post-comments', args=[self.title_match.pk])
+        self.assertEqual(self.search(url, 'фотографиях'), [other.pk])
+        self.assertEqual(self.search(url, 'отличные'), [])
@@ -0,0 +1,123 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts.models import Comment, Post
+
+
+User = get_user_model()
+
+
+class SparseFieldsetsTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.post = Post.objects.create(
+            author=self.user, title='Заголовок', text='Длинный текст ' * 50
+        )
+        self.comment = Comment.objects.create(
+            author=self.user, post=self.post, text='Да'
+        )
+
+    def get_list(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Запросы страницы, без агрегатов для ETag
+        selects = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and 'LIMIT' in query['sql']
+        ]
+        return response.data['results'], selects
+
+    def test_fields_narrow_output_and_sql(self):
+        results, selects = self.get_list(
+            reverse('post-list'), fields='id,title'
+        )
+        self.assertEqual(
+            results, [{'id': self.post.pk, 'title': 'Заголовок'}]
+        )
+        # Превью комментариев не запрашивается
+        self.assertEqual(len(selects), 1)
+        self.assertNotIn('"text"', selects[0])
+        self.assertNotIn('posts_comment', selects[0])
+
+    def test_omit(self):
+        results, selects = self.get_list(
+            reverse('post-list'), omit='text,latest_comments'
+        )
+        self.assertNotIn('text', results[0])
+        self.assertNotIn('latest_comments', results[0])
+        self.assertEqual(results[0]['comment_count'], 1)
+        self.assertNotIn('"posts_post"."text"', selects[0])
+
+    def test_default_output_is_unchanged(self):
+        results, selects = self.get_list(reverse('post-list'))
+        self.assertIn('text', results[0])
+        self.assertIn('latest_comments', results[0])
+        self.assertNotIn('text_preview', results[0])
+
+    @override_settings(POSTS_TEXT_PREVIEW_LENGTH=20)
+    def test_text_preview(self):
+        results, selects = self.get_list(
+            reverse('post-list'), fields='id,text_preview'
+        )
+        self.assertEqual(results[0]['text_preview'], 'Длинный текст Длинны…')
+        # Из БД читается только начало текста
+        self.assertIn('SUBSTRING("posts_post"."text"', selects[0])
+        self.assertEqual(selects[0].count('"posts_post"."text"'), 1)
+
+        # Короткий текст возвращается целиком
+        self.post.text = 'Коротко'
+        self.post.save()
+        results, _ = self.get_list(
+            reverse('post-list'), fields='text_preview'
+        )
+        self.assertEqual(results[0]['text_preview'], 'Коротко')
+
+    @override_settings(POSTS_TEXT_PREVIEW_LENGTH=20)
+    def test_retrieve(self):
+        response = self.client.get(
+            reverse('post-detail', args=[self.post.pk]),
+            {'fields': 'title,text_preview'}
+        )
+        self.assertEqual(response.data, {
+            'text_preview': 'Длинный текст Длинны…', 'title': 'Заголовок'
+        })
+
+    def test_comments(self):
+        results, _ = self.get_list(reverse('comment-list'), fields='id,post')
+        self.assertEqual(
+            results, [{'id': self.comment.pk, 'post': self.post.pk}]
+        )
+        results, _ = self.get_list(
+            reverse('post-comments', args=[self.post.pk]), omit='text'
+        )
+        self.assertNotIn('text', results[0])
+
+    def test_search_with_fields(self):
+        results, _ = self.get_list(
+            reverse('post-list'), search='текст', fields='title'
+        )
+        self.assertEqual(results, [{'title': 'Заголовок'}])
+
+    def test_unknown_field(self):
+        response = self.client.get(
+            reverse('post-list'), {'fields': 'title,password'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.data['fields'][0])
+
+    def test_write_ignores_fields(self):
+        self.client.login(username='user', password='user')
+        response = self.client.post(
+            reverse('post-list') + '?fields=id',
+            {'title': 'Новый', 'text': 'Текст'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['title'], 'Новый')
@@ -0,0 +1,109 @@
+import hashlib
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from posts.models import Post
+from posts.uploads import StreamingImageUploadHandler, UploadRejected
+
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def png_bytes(size=(100, 100), color=(10, 20, 30)):
+    file = BytesIO()
+    Image.new('RGB', size, color).save(file, 'PNG')
+    return file.getvalue()
+
+
+class StreamingImageUploadHandlerTestCase(SimpleTestCase):
+    def start(self, content_length=None):
+        handler = StreamingImageUploadHandler()
+        handler.new_file(
+            'image', 'photo.png', 'image/png', content_length
+        )
+        return handler
+
+    def test_hash_computed_while_streaming(self):
+        data = png_bytes()
+        handler = self.start()
+        handler.receive_data_chunk(data[:50], 0)
+        handler.receive_data_chunk(data[50:], 50)
+        file = handler.file_complete(len(data))
+        self.assertEqual(file.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(file.read(), data)
+
+    @override_settings(POSTS_IMAGE_MAX_PIXELS=100 * 100 - 1)
+    def test_rejects_pixels_from_first_chunk(self):
+        handler = self.start()
+        with self.assertRaises(UploadRejected):
+            handler.receive_data_chunk(png_bytes()[:100], 0)
+
+    @override_settings(POSTS_IMAGE_MAX_BYTES=1000)
+    def test_rejects_declared_length(self):
+        with self.assertRaises(UploadRejected):
+            self.start(content_length=1001)
+
+    @override_settings(POSTS_IMAGE_MAX_BYTES=1000)
+    def test_rejects_streamed_length(self):
+        handler = self.start()
+        handler.receive_data_chunk(b'x' * 600, 0)
+        with self.assertRaises(UploadRejected):
+            handler.receive_data_chunk(b'x' * 600, 600)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageUploadTestCase(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        User.objects.create_user(
+            username='user', password='user', birth_date='2000-01-01'
+        )
+        self.client.login(username='user', password='user')
+
+    def upload(self, data, name='photo.png'):
+        return self.client.post(
+            reverse('post-list'),
+            {
+                'title': 'Photo', 'text': 'Text',
+                'image': SimpleUploadedFile(name, data, 'image/png'),
+            },
+            format='multipart'
+        )
+
+    def test_identical_images_share_file(self):
+        data = png_bytes()
+        first = self.upload(data)
+        second = self.upload(data, name='copy.png')
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        names = set(Post.objects.values_list('image', flat=True))
+        digest = hashlib.sha256(data).hexdigest()
+        self.assertEqual(names, {f'post_images/{digest}.png'})
+        self.assertEqual(first.data['image'], second.data['image'])
+
+    @override_settings(POSTS_IMAGE_MAX_BYTES=100)
+    def test_too_big_upload(self):
+        response = self.upload(png_bytes(color=(1, 2, 3)) + b'\0' * 200)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('100', response.data['detail'])
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(POSTS_IMAGE_MAX_PIXELS=50 * 50)
+    def test_too_many_pixels(self):
+        response = self.upload(png_bytes())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
@@ -1,7 +1,11 @@
 import pytest
 from datetime import date
+from unittest import mock
 from django.core.exceptions import ValidationError
+from django.db.models import F
 
+from posts.models import AllowedEmailDomain, BannedTitleWord, ModerationVersion
+from posts.moderation import WordMatcher, lists
 from posts.validators import (
     validate_user_age,
     validate_email,
@@ -10,6 +14,10 @@ from posts.validators import (
 )
 
 
+# Списки доменов и запрещённых слов хранятся в базе
+pytestmark = pytest.mark.django_db
+
+
 def test_validate_user_age_valid():
     validate_user_age(date(2000, 1, 1))  # возраст > 18 лет, должно пройти
 
@@ -39,6 +47,28 @@ def test_validate_post_title_with_forbidden_word():
         validate_post_title(title)
 
 
+def test_validate_post_title_whole_words_only():
+    validate_post_title('Ерундатор и чепухаметр')  # слова внутри других
+
+
+def test_validate_post_title_ignores_case():
+    with pytest.raises(ValidationError):
+        validate_post_title('Полная ЧЕПУХА')
+
+
+def test_word_matcher_overlapping_words():
+    matcher = WordMatcher(['глупо', 'глупость', 'a.b'])
+    assert matcher.search('это глупость') == 'глупость'
+    assert matcher.search('это глупо') == 'глупо'
+    assert matcher.search('это глупос') is None
+    assert matcher.search('x a.b y') == 'a.b'
+    assert matcher.search('x axb y') is None  # точка экранирована
+
+
+def test_word_matcher_empty_list():
+    assert WordMatcher([]).search('что угодно') is None
+
+
 def test_validate_password_too_short():
     with pytest.raises(ValidationError):
         validate_password('abc12')  # < 8 символов
@@ -51,3 +81,52 @@ def test_validate_password_no_digit():
 
 def test_validate_password_valid():
     validate_password('abc12345')  # валидный пароль
+
+
+def test_banned_word_added_in_admin_applies_immediately():
+    validate_post_title('Полная белиберда')
+    BannedTitleWord.objects.create(word='Белиберда')
+    with pytest.raises(ValidationError):
+        validate_post_title('Полная белиберда')
+    BannedTitleWord.objects.filter(word='белиберда').delete()
+
+
+def test_allowed_domain_removed_applies_immediately():
+    validate_email('user@yandex.ru')
+    AllowedEmailDomain.objects.filter(domain='yandex.ru').delete()
+    with pytest.raises(ValidationError):
+        validate_email('user@yandex.ru')
+    AllowedEmailDomain.objects.create(domain='yandex.ru')
+
+
+def test_lists_are_not_read_from_database_on_every_call(
+    django_assert_num_queries
+):
+    validate_email('user@mail.ru')
+    with django_assert_num_queries(0):
+        validate_email('user@mail.ru')
+        validate_post_title('Нормальный заголовок')
+
+
+def test_lists_reload_after_version_changed_elsewhere():
+    # Другой процесс сменил списки: здесь видна только новая версия в базе
+    validate_post_title('Полная белиберда')
+    BannedTitleWord.objects.bulk_create([BannedTitleWord(word='белиберда')])
+    ModerationVersion.objects.filter(pk=1).update(version=F('version') + 1)
+    lists.refresh()  # так сверяет версию фоновый поток
+    with pytest.raises(ValidationError):
+        validate_post_title('Полная белиберда')
+
+
+def test_version_is_checked_in_background(django_assert_num_queries):
+    validate_email('user@mail.ru')
+    lists.checked_at = None  # интервал сверки прошёл
+    try:
+        with mock.patch('posts.moderation.executor') as executor:
+            with django_assert_num_queries(0):
+                validate_email('user@mail.ru')
+                validate_post_title('Нормальный заголовок')
+        # Повторная сверка не ставится, пока идёт первая
+        executor.submit.assert_called_once_with(lists._refresh_in_thread)
+    finally:
+        lists.refreshing = False
@@ -170,3 +170,79 @@ class ViewTestCase(APITestCase):
         view.action = 'retrieve'
         perms = view.get_permissions()
         self.assertIsInstance(perms[0], IsAdminOrAuthorOrReadOnly)
+
+    def test_post_list_embeds_comment_count_and_latest_comments(self):
+        for i in range(4):
+            Comment.objects.create(
+                post=self.post, author=self.other, text=f'Reply {i}'
+            )
+        response = self.client.get(reverse('post-list'))
+        post = response.data['results'][0]
+        self.assertEqual(post['comment_count'], 5)
+        self.assertEqual(
+            [comment['text'] for comment in post['latest_comments']],
+            ['Reply 3', 'Reply 2', 'Reply 1']
+        )
+
+    def test_post_without_comments(self):
+        Comment.objects.all().delete()
+        self.client.force_authenticate(self.user)
+        url = reverse('post-detail', args=[self.post.id])
+        response = self.client.get(url)
+        self.assertEqual(response.data['comment_count'], 0)
+        self.assertEqual(response.data['latest_comments'], [])
+
+    def test_created_post_has_empty_preview(self):
+        self.user.refresh_from_db()
+        self.client.force_authenticate(self.user)
+        data = {'title': 'Fresh', 'text': 'Text'}
+        response = self.client.post(reverse('post-list'), data)
+        self.assertEqual(response.data['comment_count'], 0)
+        self.assertEqual(response.data['latest_comments'], [])
+
+    def test_comment_list_filtered_by_post(self):
+        other_post = Post.objects.create(
+            author=self.other, title='Other', text='Text'
+        )
+        Comment.objects.create(post=other_post, author=self.user, text='X')
+        response = self.client.get(
+            reverse('comment-list'), {'post': self.post.id}
+        )
+        self.assertEqual(
+            [comment['id'] for comment in response.data['results']],
+            [self.comment.id]
+        )
+
+    def test_comment_list_invalid_post_filter(self):
+        for value in ('abc', '²', '٣'):
+            with self.subTest(post=value):
+                response = self.client.get(
+                    reverse('comment-list'), {'post': value}
+                )
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST
+                )
+
+    def test_post_comments_route(self):
+        for i in range(3):
+            Comment.objects.create(
+                post=self.post, author=self.other, text=f'Reply {i}'
+            )
+        url = reverse('post-comments', args=[self.post.id])
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [comment['text'] for comment in response.data['results']],
+            ['Reply 2', 'Reply 1']
+        )
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [comment['text'] for comment in response.data['results']],
+            ['Reply 0', 'Comment']
+        )
+        self.assertIsNone(response.data['next'])
+
+    def test_post_comments_route_unknown_post(self):
+        url = reverse('post-comments', args=[self.post.id + 100])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
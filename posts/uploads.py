@@ -0,0 +1,103 @@
+'''
+Потоковый приём изображений: файл пишется на диск частями, по ходу
+считается sha256, а размер в байтах и пикселях проверяется до того,
+как файл загружен целиком и тем более декодирован.
+'''
+import hashlib
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from PIL import Image
+
+
+# Сколько первых байт файла держать, чтобы прочитать из заголовка размеры:
+# у JPEG перед ними могут идти EXIF и встроенная миниатюра
+HEADER_BYTES = 256 * 1024
+
+
+class UploadRejected(MultiPartParserError):
+    '''DRF превращает ошибку разбора multipart в ответ 400'''
+
+
+def check_pixels(width, height):
+    if width * height > settings.POSTS_IMAGE_MAX_PIXELS:
+        raise UploadRejected(
+            f'Изображение {width}x{height} больше '
+            f'{settings.POSTS_IMAGE_MAX_PIXELS} пикселей'
+        )
+
+
+def content_hash(file):
+    '''sha256 содержимого: посчитанный при загрузке или по файлу'''
+    digest = getattr(file, 'sha256', None)
+    if digest is None:
+        sha256 = hashlib.sha256()
+        for chunk in file.chunks():
+            sha256.update(chunk)
+        digest = sha256.hexdigest()
+        file.seek(0)
+    return digest
+
+
+class StreamingImageUploadHandler(TemporaryFileUploadHandler):
+    '''
+    Пишет загрузку во временный файл частями. Отклоняет файл, как только
+    он превысил POSTS_IMAGE_MAX_BYTES или заголовок изображения показал
+    больше POSTS_IMAGE_MAX_PIXELS пикселей (защита от «бомб» — маленьких
+    файлов, которые разворачиваются в гигабайты при декодировании).
+    '''
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        if self.content_length and \
+                self.content_length > settings.POSTS_IMAGE_MAX_BYTES:
+            self.reject(self.too_big_message())
+        self.sha256 = hashlib.sha256()
+        self.received = 0
+        self.header = BytesIO()
+        self.header_checked = False
+
+    def too_big_message(self):
+        return f'Файл больше {settings.POSTS_IMAGE_MAX_BYTES} байт'
+
+    def reject(self, message):
+        self.upload_interrupted()
+        raise UploadRejected(message)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.POSTS_IMAGE_MAX_BYTES:
+            self.reject(self.too_big_message())
+        self.sha256.update(raw_data)
+        if not self.header_checked:
+            self.check_header(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def check_header(self, raw_data):
+        self.header.write(raw_data)
+        self.header.seek(0)
+        try:
+            with Image.open(self.header) as image:
+                width, height = image.size
+        except Exception:
+            # Заголовок ещё не пришёл целиком или это не изображение —
+            # тогда решит валидация поля
+            self.header.seek(0, os.SEEK_END)
+            if self.header.tell() >= HEADER_BYTES:
+                self.header_checked = True
+                self.header = None
+            return
+        self.header_checked = True
+        self.header = None
+        try:
+            check_pixels(width, height)
+        except UploadRejected as exc:
+            self.reject(str(exc))
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.sha256.hexdigest()
+        return file
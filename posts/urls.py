@@ -1,9 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import SimpleRouter
 
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import (TokenObtainPairView,
+                                            TokenObtainSlidingView,
+                                            TokenRefreshSlidingView,
+                                            TokenRefreshView, TokenVerifyView)
 
-from posts.views import UserViewSet, PostViewSet, CommentViewSet
+from posts import async_views
+from posts.serializers import (ClaimsTokenObtainPairSerializer,
+                               ClaimsTokenObtainSlidingSerializer)
+from posts.views import (UserViewSet, PostViewSet, CommentViewSet,
+                         CacheStatsView)
 
 
 router = SimpleRouter()
@@ -13,6 +20,47 @@ router.register(r'comments', CommentViewSet, basename='comment')
 
 
 urlpatterns = [
-  path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+  path(
+    'api/token/',
+    TokenObtainPairView.as_view(
+      serializer_class=ClaimsTokenObtainPairSerializer
+    ),
+    name='token_obtain_pair'
+  ),
+  path(
+    'api/token/refresh/',
+    TokenRefreshView.as_view(),
+    name='token_refresh'
+  ),
+  path('api/token/verify/', TokenVerifyView.as_view(), name='token_verify'),
+  path(
+    'api/token/sliding/',
+    TokenObtainSlidingView.as_view(
+      serializer_class=ClaimsTokenObtainSlidingSerializer
+    ),
+    name='token_obtain_sliding'
+  ),
+  path(
+    'api/token/sliding/refresh/',
+    TokenRefreshSlidingView.as_view(),
+    name='token_refresh_sliding'
+  ),
+  path('cache/stats/', CacheStatsView.as_view(), name='cache_stats'),
+  path('async/posts/', async_views.post_list, name='async-post-list'),
+  path(
+    'async/posts/<int:pk>/',
+    async_views.post_detail,
+    name='async-post-detail'
+  ),
+  path(
+    'async/comments/',
+    async_views.comment_list,
+    name='async-comment-list'
+  ),
+  path(
+    'async/comments/<int:pk>/',
+    async_views.comment_detail,
+    name='async-comment-detail'
+  ),
   path('', include(router.urls)),
 ]
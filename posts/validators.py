@@ -1,8 +1,7 @@
-import re
 from datetime import date
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
-from .constants import ALLOWED_EMAIL_DOMAINS, BANNED_TITLE_WORDS
+from .moderation import get_allowed_email_domains, get_title_matcher
 
 
 def validate_password(password):
@@ -17,10 +16,10 @@ def validate_password(password):
 
 def validate_email(email):
     '''
-    Разрешены только домены: mail.ru, yandex.ru (см. ALLOWED_EMAIL_DOMAINS)
+    Разрешены только домены из списка AllowedEmailDomain (правится в админке)
     '''
     domain = email.split('@')[-1]
-    if domain not in ALLOWED_EMAIL_DOMAINS:
+    if domain.lower() not in get_allowed_email_domains():
         raise ValidationError(_(f'Недопустимый домен: {domain}'))
 
 
@@ -36,11 +35,10 @@ def validate_user_age(birth_date):
 
 def validate_post_title(title):
     '''
-    Заголовок не должен содержать запрещённых слов (см. BANNED_TITLE_WORDS)
+    Заголовок не должен содержать запрещённых слов (см. BannedTitleWord)
     '''
-    lower_title = title.lower()
-    for word in BANNED_TITLE_WORDS:
-        if re.search(rf'\b{re.escape(word)}\b', lower_title):
-            raise ValidationError(
-                _(f'Заголовок содержит запрещённое слово: "{word}"')
-            )
+    word = get_title_matcher().search(title)
+    if word is not None:
+        raise ValidationError(
+            _(f'Заголовок содержит запрещённое слово: "{word}"')
+        )
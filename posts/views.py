@@ -1,28 +1,97 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.db.models.functions import Substr
 from rest_framework import viewsets
-from rest_framework.exceptions import PermissionDenied
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import action
+from rest_framework.exceptions import (NotFound, PermissionDenied,
+                                       ValidationError)
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (OpenApiParameter, extend_schema,
+                                   extend_schema_view)
 
+from posts.bulk import BulkWriteMixin, parse_pk
+from posts.cache import (CachedListMixin, get_stats, invalidate,
+                         invalidate_comments, post_comments_namespaces)
+from posts.conditional import ConditionalGetMixin
+from posts.fast import FastReadMixin
 from posts.models import User, Post, Comment
-from posts.serializers import UserSerializer, PostSerializer, CommentSerializer
+from posts.pagination import KeysetCursorPagination
+from posts.replicas import ReplicaReadMixin
+from posts.search import FullTextSearchFilter
+from posts.serializers import (UserSerializer, PostSerializer,
+                               CommentSerializer, latest_comments_queryset)
+from posts.sparse import SPARSE_FIELDS_PARAMETERS, SparseFieldsetsMixin
 from posts.permissions import (IsAdminOrAuthorOrReadOnly,
                                IsAdminOrSelfOrReadOnly)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                  viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAdminOrSelfOrReadOnly]
+    # Поколение для ETag списка; сами страницы не кешируются
+    cache_namespaces = ('users',)
 
     def get_permissions(self):
         if self.action == 'create':
             return [AllowAny()]
         return super().get_permissions()
 
+    def get_object_validators(self, obj):
+        # Счётчики меняются UPDATE ... F() без updated_at: только ETag
+        return (
+            (obj.pk, obj.updated_at, obj.post_count, obj.comment_count),
+            None
+        )
 
-class PostViewSet(viewsets.ModelViewSet):
+
+@extend_schema_view(
+    list=extend_schema(parameters=SPARSE_FIELDS_PARAMETERS),
+    retrieve=extend_schema(parameters=SPARSE_FIELDS_PARAMETERS),
+)
+class PostViewSet(ReplicaReadMixin, ConditionalGetMixin, CachedListMixin,
+                  BulkWriteMixin, SparseFieldsetsMixin, FastReadMixin,
+                  viewsets.ModelViewSet):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsAdminOrAuthorOrReadOnly]
+    pagination_class = KeysetCursorPagination
+    filter_backends = [FullTextSearchFilter]
+    # В списке постов есть счётчик и превью комментариев
+    cache_namespaces = ('posts', 'comments')
+    lookup_value_regex = r'\d+'
+    sparse_columns = {'image_variants': ('image', 'image_variants')}
+
+    def get_queryset(self):
+        # Вектор поиска нужен только в WHERE, в ответ он не попадает
+        queryset = super().get_queryset().defer('search_vector')
+        # Превью нужно и для ETag детального ответа
+        if self.action != 'list' or self.wants_field('latest_comments'):
+            queryset = queryset.prefetch_related(Prefetch(
+                'comments',
+                queryset=latest_comments_queryset(),
+                to_attr='prefetched_latest_comments'
+            ))
+        if self.wants_field('text_preview'):
+            # На символ длиннее превью: так видно, что текст обрезан
+            queryset = queryset.annotate(text_preview=Substr(
+                'text', 1, settings.POSTS_TEXT_PREVIEW_LENGTH + 1
+            ))
+        return queryset
+
+    def get_object_validators(self, obj):
+        # Превью и счётчик комментариев меняются без изменения поста, а
+        # Last-Modified при удалении комментария ушёл бы назад — только ETag
+        latest = [
+            (comment.pk, comment.updated_at)
+            for comment in obj.prefetched_latest_comments
+        ]
+        return (obj.pk, obj.updated_at, obj.comment_count, latest), None
 
     def get_permissions(self):
         if self.action == 'list':
@@ -30,13 +99,66 @@ class PostViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        # Пост и счётчик автора (сигнал post_save) — одной транзакцией
+        with transaction.atomic():
+            serializer.save(author_id=self.request.user.id)
+
+    def after_bulk_create(self, instances):
+        invalidate('posts')
+        # У новых постов нет комментариев: сериализатору не нужны запросы
+        for post in instances:
+            post.prefetched_latest_comments = []
 
+    def after_bulk_update(self, instances):
+        invalidate('posts')
 
-class CommentViewSet(viewsets.ModelViewSet):
+    @extend_schema(
+        responses=CommentSerializer(many=True),
+        parameters=SPARSE_FIELDS_PARAMETERS
+    )
+    @action(detail=True, serializer_class=CommentSerializer)
+    def comments(self, request, pk=None):
+        '''Комментарии поста, постранично по индексу (post, created_at, id)'''
+        def build_response():
+            if not Post.objects.filter(pk=pk).exists():
+                raise NotFound('Пост не найден')
+            comments = Comment.objects.filter(post_id=pk)
+            return self.list_response(
+                self.filter_queryset(comments.defer('search_vector'))
+            )
+
+        # Комментарии других постов эту страницу не сбрасывают
+        return self.cached_response(
+            request, build_response, post_comments_namespaces(pk)
+        )
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=[
+        OpenApiParameter('post', int, description='Только комментарии поста'),
+        *SPARSE_FIELDS_PARAMETERS,
+    ]),
+    retrieve=extend_schema(parameters=SPARSE_FIELDS_PARAMETERS),
+)
+class CommentViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                     CachedListMixin, BulkWriteMixin, SparseFieldsetsMixin,
+                     FastReadMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsAdminOrAuthorOrReadOnly]
+    pagination_class = KeysetCursorPagination
+    filter_backends = [FullTextSearchFilter]
+    cache_namespaces = ('comments',)
+
+    def get_queryset(self):
+        queryset = super().get_queryset().defer('search_vector')
+        post = self.request.query_params.get('post')
+        if post is not None:
+            # isdigit() пропускает и не-ASCII цифры вроде '²'
+            if not (post.isascii() and post.isdigit()):
+                raise ValidationError({'post': 'Некорректный id поста'})
+            queryset = queryset.filter(post_id=post)
+        return queryset
 
     def get_permissions(self):
         if self.action == 'list':
@@ -46,4 +168,41 @@ class CommentViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         if self.request.user.is_anonymous:
             raise PermissionDenied('Учетные данные не предоставлены')
-        serializer.save(author=self.request.user)
+        with transaction.atomic():
+            serializer.save(author_id=self.request.user.id)
+
+    def perform_update(self, serializer):
+        # Комментарий могут перенести к другому посту вместе со счётчиком
+        with transaction.atomic():
+            serializer.save()
+
+    def get_bulk_serializer_context(self, items):
+        context = super().get_bulk_serializer_context(items)
+        post_ids = {
+            parse_pk(item.get('post')) for item in items
+            if isinstance(item, dict)
+        }
+        post_ids.discard(None)
+        # Все упомянутые посты одним запросом
+        context['preloaded_posts'] = Post.objects.in_bulk(post_ids)
+        return context
+
+    def after_bulk_create(self, instances):
+        invalidate_comments(*(comment.post_id for comment in instances))
+
+    def after_bulk_update(self, instances):
+        # Страницы и постов, откуда комментарии перенесли
+        invalidate_comments(*(
+            post_id for comment in instances
+            for post_id in (comment.post_id,
+                            comment._counter_keys.get('post_id'))
+        ))
+
+
+class CacheStatsView(APIView):
+    '''Счётчики попаданий и промахов кеша списков'''
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def get(self, request):
+        return Response(get_stats())